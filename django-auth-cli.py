@@ -1,5 +1,12 @@
 import os
 import sys
+import re
+import json
+import time
+import atexit
+import contextlib
+import functools
+import threading
 import subprocess
 import textwrap
 
@@ -27,7 +34,129 @@ def print_warning(msg):
 def print_error(msg):
     print(f"{Colors.FAIL}✖ {msg}{Colors.ENDC}")
 
+# Answers for unattended runs: --answers file.json, DJANGO_CLI_<KEY> variables, --yes
+ANSWERS = {}
+ASSUME_DEFAULTS = False
+
+def pop_option(argv, name, default=None):
+    # Remove "name value" (or "name=value") from argv and return the value
+    for i, arg in enumerate(argv):
+        if arg == name:
+            if i + 1 >= len(argv) or argv[i + 1].startswith('--'):
+                print_error(f"{name} expects a value.")
+                sys.exit(1)
+            value = argv[i + 1]
+            del argv[i:i + 2]
+            return value
+        if arg.startswith(name + '='):
+            del argv[i]
+            return arg.split('=', 1)[1]
+    return default
+
+def load_answers(argv):
+    """Strip the global --answers/--yes flags from argv and load the answers file."""
+    global ASSUME_DEFAULTS
+    answers_path = pop_option(argv, '--answers', os.environ.get('DJANGO_CLI_ANSWERS'))
+    if answers_path:
+        with open(answers_path, 'r') as f:
+            ANSWERS.update(json.load(f))
+    if '--yes' in argv:
+        argv.remove('--yes')
+        ASSUME_DEFAULTS = True
+    return argv
+
+def ask(key, prompt):
+    """input() that can be answered in advance; an empty answer selects the [default] shown in the prompt."""
+    env_name = 'DJANGO_CLI_' + re.sub(r"\W+", "_", key).upper()
+    if key in ANSWERS:
+        value = ANSWERS[key]
+        value = ('yes' if value else 'no') if isinstance(value, bool) else str(value)
+    elif env_name in os.environ:
+        value = os.environ[env_name]
+    elif ASSUME_DEFAULTS:
+        value = ''
+    else:
+        return input(prompt)
+    print(f"{prompt}{value}")
+    return value
+
+# Phase timings: --timings prints a summary at exit, --trace file.json writes Chrome trace events
+TRACE_EVENTS = []
+TRACE_ENABLED = False
+TRACE_ORIGIN = time.perf_counter()
+
+@contextlib.contextmanager
+def phase(name):
+    if not TRACE_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        TRACE_EVENTS.append({
+            'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+            'ts': (start - TRACE_ORIGIN) * 1e6, 'dur': (time.perf_counter() - start) * 1e6,
+        })
+
+def traced(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with phase(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+def phase_summary(events):
+    """Rows of (name, calls, total_us, self_us); self time excludes phases nested on the same thread."""
+    rows = {}
+    by_thread = {}
+    for event in events:
+        by_thread.setdefault(event['tid'], []).append(event)
+    for thread_events in by_thread.values():
+        thread_events.sort(key=lambda e: (e['ts'], -e['dur']))
+        stack = []
+        for event in thread_events:
+            while stack and event['ts'] >= stack[-1]['ts'] + stack[-1]['dur']:
+                stack.pop()
+            row = rows.setdefault(event['name'], [event['name'], 0, 0.0, 0.0])
+            row[1] += 1
+            row[2] += event['dur']
+            row[3] += event['dur']
+            if stack:
+                rows[stack[-1]['name']][3] -= event['dur']
+            stack.append(event)
+    return sorted(rows.values(), key=lambda row: row[3], reverse=True)
+
+def report_timings(trace_path=None, show_summary=True):
+    if trace_path:
+        with open(trace_path, 'w') as f:
+            json.dump({'traceEvents': TRACE_EVENTS, 'displayTimeUnit': 'ms'}, f)
+        print(f"\nTrace written to {trace_path} (open it in chrome://tracing or ui.perfetto.dev)")
+    if show_summary and TRACE_EVENTS:
+        print("\n" + "="*72)
+        print(f"{'Phase':<44} | {'Calls':>5} | {'Total (s)':>9} | {'Self (s)':>8}")
+        print("-"*72)
+        for name, calls, total, self_time in phase_summary(TRACE_EVENTS):
+            print(f"{name[:44]:<44} | {calls:>5} | {total / 1e6:>9.3f} | {self_time / 1e6:>8.3f}")
+        print("="*72)
+
+def start_tracing(argv):
+    """Strip the global --timings/--trace flags from argv and report at exit."""
+    global TRACE_ENABLED
+    trace_path = pop_option(argv, '--trace')
+    show_summary = '--timings' in argv
+    if show_summary:
+        argv.remove('--timings')
+    if trace_path or show_summary:
+        TRACE_ENABLED = True
+        atexit.register(report_timings, trace_path, show_summary)
+    return argv
+
 def run_command(command, capture_output=False):
+    with phase("subprocess: " + command.replace(sys.executable + " ", "")[:60]):
+        return _run_command(command, capture_output)
+
+def _run_command(command, capture_output=False):
     try:
         if capture_output:
             result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
@@ -52,7 +181,14 @@ def get_project_name():
                 return item
     return 'my_django_project' # Fallback default
 
-def setup_accounts_app(app_name='accounts', project_name='Config'):
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+}
+
+@traced
+def setup_accounts_app(app_name='accounts', project_name='Config', session_engine='db'):
     print(f"{Colors.BOLD}Setting up '{app_name}' app...{Colors.ENDC}")
     if not os.path.exists(app_name):
         run_command(f"{sys.executable} manage.py startapp {app_name}")
@@ -90,6 +226,21 @@ def setup_accounts_app(app_name='accounts', project_name='Config'):
             modified = True
             print_success(f"Added {setting.split(' = ')[0]} to settings.py")
 
+    # Session storage: cached_db/cache avoid a session row read on every authenticated request
+    if session_engine != 'db' and "SESSION_ENGINE" not in content:
+        content += f"SESSION_ENGINE = '{SESSION_ENGINES[session_engine]}'\n"
+        modified = True
+        print_success(f"Configured SESSION_ENGINE to '{session_engine}'.")
+        if "CACHES" not in content:
+            print_warning("No CACHES configured: sessions will use per-process local memory.")
+            print_warning("Run 'python django-cli.py cache:config' to share the cache between workers.")
+
+    # Role and permission checks read from the cache (see accounts/roles.py)
+    if "AUTHENTICATION_BACKENDS" not in content:
+        content += f"AUTHENTICATION_BACKENDS = ['{app_name}.backends.CachedModelBackend']\n"
+        modified = True
+        print_success("Configured AUTHENTICATION_BACKENDS to the cached role backend.")
+
     # Commented SMTP block
     smtp_block = textwrap.dedent("""
         # SMTP Settings (Uncomment and configure for Production)
@@ -122,69 +273,909 @@ def setup_accounts_app(app_name='accounts', project_name='Config'):
             
     return True
 
+def print_clearsessions_schedule(session_engine='db'):
+    if session_engine == 'cache':
+        print_info("Cache-backed sessions expire on their own; no clearsessions job needed.")
+        return
+    print_info("Expired sessions stay in the database until 'clearsessions' runs. Schedule it daily, e.g. with cron:")
+    print(f"    0 3 * * * cd {os.getcwd()} && {sys.executable} manage.py clearsessions")
+    print_info("(cPanel: Advanced > Cron Jobs, paste the command part.)")
+
+SESSION_BENCHMARK_CODE = textwrap.dedent("""
+    import time
+    from importlib import import_module
+    engines = ['db', 'cached_db', 'cache', 'signed_cookies']
+    n = 500
+    print(f"{'ENGINE':<16} | {'LOAD (us)':>10}")
+    print('-' * 30)
+    for name in engines:
+        store = import_module(f'django.contrib.sessions.backends.{name}').SessionStore
+        session = store()
+        session['_auth_user_id'] = '1'
+        session['payload'] = 'x' * 64
+        session.save()
+        key = session.session_key
+        start = time.perf_counter()
+        for _ in range(n):
+            store(session_key=key).load()
+        elapsed = (time.perf_counter() - start) / n * 1e6
+        print(f'{name:<16} | {elapsed:>10.1f}')
+        session.delete()
+""")
+
+@traced
+def benchmark_sessions():
+    print_info("Comparing session load cost across engines...")
+    try:
+        subprocess.check_call([sys.executable, 'manage.py', 'shell', '-c', SESSION_BENCHMARK_CODE])
+    except subprocess.CalledProcessError:
+        print_error("Session benchmark failed.")
+
+@traced
 def generate_models(app_name):
     path = os.path.join(app_name, 'models.py')
     content = textwrap.dedent("""\
         from django.contrib.auth.models import AbstractUser
+        from django.contrib.postgres.indexes import OpClass
         from django.db import models
+        from django.db.models.functions import Upper
+        from django.utils import timezone
+        from django.utils.functional import cached_property
+
+        from .roles import get_roles
+
+        class PatternOpClass(OpClass):
+            \"\"\"text_pattern_ops on PostgreSQL; other databases index the bare expression.\"\"\"
+            def as_sqlite(self, compiler, connection, **extra_context):
+                return compiler.compile(self.get_source_expressions()[0])
+
+            as_mysql = as_oracle = as_sqlite
 
         class CustomUser(AbstractUser):
+            # Indexed for the user list search (username is already unique, hence indexed)
+            email = models.EmailField('email address', blank=True, db_index=True)
             photo_profil = models.ImageField(upload_to='profiles/', null=True, blank=True)
             otp_code = models.CharField(max_length=6, blank=True, null=True)
             otp_created_at = models.DateTimeField(blank=True, null=True)
+            otp_attempts = models.PositiveSmallIntegerField(default=0)
+
+            class Meta(AbstractUser.Meta):
+                swappable = 'AUTH_USER_MODEL'
+                # email__istartswith compiles to UPPER(email) LIKE 'X%' on PostgreSQL. Under a non-C
+                # collation only a text_pattern_ops index can serve that prefix match.
+                indexes = [models.Index(PatternOpClass(Upper('email'), name='text_pattern_ops'), name='accounts_user_email_upper_idx')]
             
             def __str__(self):
                 return self.username
+
+            @cached_property
+            def role_names(self):
+                # Served from the role cache; request.user is loaded once, so this lives as long as the request
+                return get_roles(self)['groups']
+
+        class OutboxEmail(models.Model):
+            \"\"\"Queued outgoing email, delivered by 'manage.py send_outbox'.\"\"\"
+            PENDING, SENT, FAILED = 'pending', 'sent', 'failed'
+            STATUS_CHOICES = [(PENDING, 'Pending'), (SENT, 'Sent'), (FAILED, 'Failed')]
+
+            subject = models.CharField(max_length=255)
+            body = models.TextField()
+            from_email = models.CharField(max_length=255, blank=True)
+            recipients = models.TextField(help_text='One address per line')
+            status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+            attempts = models.PositiveSmallIntegerField(default=0)
+            next_attempt_at = models.DateTimeField(default=timezone.now)
+            last_error = models.TextField(blank=True)
+            created_at = models.DateTimeField(auto_now_add=True)
+            sent_at = models.DateTimeField(null=True, blank=True)
+
+            class Meta:
+                indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+            def __str__(self):
+                return f'{self.subject} -> {self.recipients}'
     """)
     with open(path, 'w') as f:
         f.write(content)
     print_success("Generated CustomUser model in models.py")
 
+@traced
+def generate_roles(app_name):
+    roles_path = os.path.join(app_name, 'roles.py')
+    roles_content = textwrap.dedent("""\
+        \"\"\"Per-user cache of group names and permissions.
+
+        Entries are keyed by user id under a global version: signals.py deletes one
+        user's entry when their groups change and bumps the version when a group
+        (or its permissions) changes, which drops every entry at once.
+        \"\"\"
+        import time
+
+        from django.conf import settings
+        from django.contrib.auth.models import Permission
+        from django.core.cache import cache
+
+        # A per-process locmem cache only sees its own worker's invalidations: keep entries short-lived there
+        LOCAL_CACHE = 'LocMemCache' in settings.CACHES['default']['BACKEND']
+        ROLE_CACHE_TIMEOUT = getattr(settings, 'ACCOUNTS_ROLE_CACHE_TIMEOUT', 30 if LOCAL_CACHE else 60 * 15)
+        ROLE_VERSION_KEY = 'accounts:roles:version'
+
+
+        def role_cache_key(user_id):
+            return f'accounts:roles:{user_id}'
+
+
+        def current_version():
+            # A timestamp rather than a counter: if the key is evicted, old entries stay unreachable
+            return cache.get_or_set(ROLE_VERSION_KEY, lambda: time.time_ns(), timeout=None)
+
+
+        def perm_names(queryset):
+            return frozenset(f'{app}.{codename}' for app, codename in queryset.values_list('content_type__app_label', 'codename'))
+
+
+        def load_roles(user):
+            if user.is_superuser:
+                group_perms = user_perms = perm_names(Permission.objects.all())
+            else:
+                group_perms = perm_names(Permission.objects.filter(group__user=user))
+                user_perms = perm_names(user.user_permissions.all())
+            return {
+                'groups': frozenset(user.groups.values_list('name', flat=True)),
+                'group_permissions': group_perms,
+                'permissions': group_perms | user_perms,
+            }
+
+
+        def get_roles(user):
+            version = current_version()
+            key = role_cache_key(user.pk)
+            roles = cache.get(key, version=version)
+            if roles is None:
+                roles = load_roles(user)
+                cache.set(key, roles, ROLE_CACHE_TIMEOUT, version=version)
+            return roles
+
+
+        def invalidate_user(user_id):
+            cache.delete(role_cache_key(user_id), version=current_version())
+
+
+        def invalidate_all():
+            cache.set(ROLE_VERSION_KEY, time.time_ns(), timeout=None)
+    """)
+    with open(roles_path, 'w') as f:
+        f.write(roles_content)
+    print_success("Generated roles.py (cached group names and permissions)")
+
+    backends_path = os.path.join(app_name, 'backends.py')
+    backends_content = textwrap.dedent("""\
+        from django.contrib.auth.backends import ModelBackend
+
+        from .roles import get_roles
+
+
+        class CachedModelBackend(ModelBackend):
+            \"\"\"ModelBackend whose permission lookups come from the role cache.\"\"\"
+
+            def get_group_permissions(self, user_obj, obj=None):
+                if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+                    return set()
+                if not hasattr(user_obj, '_group_perm_cache'):
+                    user_obj._group_perm_cache = set(get_roles(user_obj)['group_permissions'])
+                return user_obj._group_perm_cache
+
+            def get_all_permissions(self, user_obj, obj=None):
+                if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+                    return set()
+                if not hasattr(user_obj, '_perm_cache'):
+                    user_obj._perm_cache = set(get_roles(user_obj)['permissions'])
+                return user_obj._perm_cache
+    """)
+    with open(backends_path, 'w') as f:
+        f.write(backends_content)
+    print_success("Generated backends.py (CachedModelBackend)")
+
+def ensure_commands_dir(app_name):
+    commands_dir = os.path.join(app_name, 'management', 'commands')
+    os.makedirs(commands_dir, exist_ok=True)
+    for d in [os.path.dirname(commands_dir), commands_dir]:
+        init_file = os.path.join(d, '__init__.py')
+        if not os.path.exists(init_file):
+            with open(init_file, 'w') as f:
+                f.write("")
+    return commands_dir
+
+OUTBOX_MODULE = '''\
+"""Database-backed outbox: requests only enqueue, 'manage.py send_outbox' delivers."""
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+LEASE = timedelta(minutes=5)
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+
+
+def enqueue_email(subject, body, recipients, from_email=None):
+    email = OutboxEmail.objects.create(
+        subject=subject, body=body, recipients='\\n'.join(recipients), from_email=from_email or '',
+    )
+    if getattr(settings, 'ACCOUNTS_OUTBOX_SEND_NOW', False):
+        # Development/tests: deliver right after the surrounding transaction commits
+        transaction.on_commit(lambda: record_results(send_messages([email])))
+    return email
+
+
+def claim_batch(size):
+    """Lease up to size due emails; skip_locked lets several workers claim disjoint batches."""
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEmail.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:size]
+        )
+        # A worker that dies mid-batch releases its emails when the lease expires
+        OutboxEmail.objects.filter(pk__in=[e.pk for e in emails]).update(next_attempt_at=now + LEASE)
+    return emails
+
+
+def send_messages(emails):
+    """Send a batch over one SMTP connection; returns (email, error or None) pairs. No database access."""
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        return [(email, e) for email in emails]
+    results = []
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email or None,
+                email.recipients.split('\\n'), connection=connection,
+            )
+            try:
+                message.send()
+                results.append((email, None))
+            except Exception as e:
+                results.append((email, e))
+    finally:
+        connection.close()
+    return results
+
+
+def record_results(results, max_attempts=5):
+    now = timezone.now()
+    for email, error in results:
+        email.attempts += 1
+        if error is None:
+            email.status, email.sent_at, email.last_error = OutboxEmail.SENT, now, ''
+        elif email.attempts >= max_attempts:
+            email.status, email.last_error = OutboxEmail.FAILED, str(error)
+        else:
+            # Exponential backoff with jitter so a recovering SMTP server is not hit all at once
+            delay = min(BACKOFF_BASE_SECONDS * 2 ** (email.attempts - 1), BACKOFF_MAX_SECONDS)
+            email.next_attempt_at = now + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+            email.last_error = str(error)
+    OutboxEmail.objects.bulk_update(
+        [email for email, _ in results],
+        ['status', 'attempts', 'sent_at', 'last_error', 'next_attempt_at'],
+    )
+    return sum(error is None for _, error in results)
+'''
+
+SEND_OUTBOX_COMMAND = '''\
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from ...outbox import claim_batch, record_results, send_messages
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails: SMTP batches in a thread pool, failed sends retried with backoff.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Emails sent per SMTP connection')
+        parser.add_argument('--workers', type=int, default=4, help='Concurrent SMTP connections')
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when the queue is empty')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        batch_size, workers = max(1, options['batch_size']), max(1, options['workers'])
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                sent, failed = self.drain(pool, batch_size, workers, options['max_attempts'])
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent}, failed {failed}.')
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+    def drain(self, pool, batch_size, workers, max_attempts):
+        sent = failed = 0
+        while True:
+            emails = claim_batch(batch_size * workers)
+            if not emails:
+                return sent, failed
+            batches = [emails[i:i + batch_size] for i in range(0, len(emails), batch_size)]
+            # Threads only talk SMTP; results are written back from this thread
+            for results in pool.map(send_messages, batches):
+                delivered = record_results(results, max_attempts)
+                sent += delivered
+                failed += len(results) - delivered
+'''
+
+OTP_MODULE = '''\
+"""One-time login codes behind a small store interface.
+
+CacheOTPStore keeps codes out of the user table; DatabaseOTPStore writes only the
+otp_* columns with UPDATE queries (no full-row save, no post_save). Both expire codes
+after ACCOUNTS_OTP_TTL seconds and drop them after ACCOUNTS_OTP_MAX_ATTEMPTS wrong guesses.
+"""
+import hmac
+import secrets
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+OTP_TTL = getattr(settings, 'ACCOUNTS_OTP_TTL', 5 * 60)
+OTP_MAX_ATTEMPTS = getattr(settings, 'ACCOUNTS_OTP_MAX_ATTEMPTS', 5)
+
+
+def generate_code():
+    return f'{secrets.randbelow(10 ** 6):06d}'
+
+
+def codes_match(expected, given):
+    return bool(expected) and hmac.compare_digest(str(expected), str(given))
+
+
+class OTPStore(ABC):
+    @abstractmethod
+    def issue(self, user_id):
+        """Create (or replace) the user's code and return it."""
+
+    @abstractmethod
+    def verify(self, user_id, code):
+        """True once for the right code; counts wrong guesses and expires the code."""
+
+
+class CacheOTPStore(OTPStore):
+    def code_key(self, user_id):
+        return f'accounts:otp:{user_id}'
+
+    def attempts_key(self, user_id):
+        return f'accounts:otp:{user_id}:attempts'
+
+    def issue(self, user_id):
+        code = generate_code()
+        cache.set_many({self.code_key(user_id): code, self.attempts_key(user_id): 0}, OTP_TTL)
+        return code
+
+    def verify(self, user_id, code):
+        try:
+            # incr is atomic on memcached/redis, so parallel guesses are all counted
+            attempts = cache.incr(self.attempts_key(user_id))
+        except ValueError:
+            return False  # expired or never issued
+        expected = cache.get(self.code_key(user_id))
+        if attempts > OTP_MAX_ATTEMPTS or not codes_match(expected, code):
+            if attempts >= OTP_MAX_ATTEMPTS:
+                cache.delete_many([self.code_key(user_id), self.attempts_key(user_id)])
+            return False
+        cache.delete_many([self.code_key(user_id), self.attempts_key(user_id)])
+        return True
+
+
+class DatabaseOTPStore(OTPStore):
+    def users(self, user_id):
+        from django.contrib.auth import get_user_model
+        return get_user_model().objects.filter(pk=user_id)
+
+    def issue(self, user_id):
+        code = generate_code()
+        self.users(user_id).update(otp_code=code, otp_created_at=timezone.now(), otp_attempts=0)
+        return code
+
+    def verify(self, user_id, code):
+        live = self.users(user_id).filter(
+            otp_code__isnull=False,
+            otp_created_at__gte=timezone.now() - timedelta(seconds=OTP_TTL),
+            otp_attempts__lt=OTP_MAX_ATTEMPTS,
+        )
+        # Count the attempt first, in the same statement that checks TTL and the attempt limit
+        if not live.update(otp_attempts=F('otp_attempts') + 1):
+            return False
+        expected = self.users(user_id).values_list('otp_code', flat=True).first()
+        if not codes_match(expected, code):
+            return False
+        self.users(user_id).update(otp_code=None, otp_created_at=None, otp_attempts=0)
+        return True
+
+
+def get_otp_store():
+    backend = getattr(settings, 'ACCOUNTS_OTP_STORE', None)
+    if backend is None:
+        # A per-process locmem cache would lose codes issued by another worker
+        backend = 'db' if 'LocMemCache' in settings.CACHES['default']['BACKEND'] else 'cache'
+    return DatabaseOTPStore() if backend == 'db' else CacheOTPStore()
+'''
+
+RATELIMIT_MODULE = '''\
+"""Cache-backed sliding-window rate limits for login and OTP attempts.
+
+Each rule allows `limit` requests per `window` seconds per key (IP, username, ...).
+The window slides by weighting the previous fixed bucket, so a check costs one
+cache.incr and one cache.get. With a locmem cache each worker counts on its own.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+LOGIN_RATE_LIMITS = getattr(settings, 'ACCOUNTS_LOGIN_RATE_LIMITS', {'ip': (20, 60), 'username': (5, 60)})
+OTP_RATE_LIMITS = getattr(settings, 'ACCOUNTS_OTP_RATE_LIMITS', {'ip': (20, 60), 'user': (5, 60)})
+# e.g. 'HTTP_X_FORWARDED_FOR' behind a trusted reverse proxy
+CLIENT_IP_HEADER = getattr(settings, 'ACCOUNTS_CLIENT_IP_HEADER', 'REMOTE_ADDR')
+# Proxies in front of Django that append to that header (2 for a CDN in front of nginx)
+TRUSTED_PROXY_COUNT = getattr(settings, 'ACCOUNTS_TRUSTED_PROXY_COUNT', 1)
+
+
+def client_ip(request):
+    """Address the limits are keyed on, read TRUSTED_PROXY_COUNT entries from the right of the header."""
+    remote_addr = request.META.get('REMOTE_ADDR', '')
+    if CLIENT_IP_HEADER == 'REMOTE_ADDR':
+        return remote_addr
+    entries = [entry.strip() for entry in request.META.get(CLIENT_IP_HEADER, '').split(',') if entry.strip()]
+    if not entries:
+        return remote_addr
+    # Each proxy appends the address it received from; anything further left is sent by the client
+    return entries[-min(TRUSTED_PROXY_COUNT, len(entries))]
+
+
+def hit(scope, key, limit, window):
+    """Count one request; True when the sliding-window count is over limit."""
+    now = time.time()
+    bucket = int(now // window)
+    # Hashed: usernames can hold characters memcached refuses in keys
+    base = 'accounts:rl:%s:%s' % (scope, hashlib.sha256(key.encode()).hexdigest()[:32])
+    current_key = f'{base}:{bucket}'
+    cache.add(current_key, 0, window * 2)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(current_key, 1, window * 2)
+        current = 1
+    previous = cache.get(f'{base}:{bucket - 1}', 0)
+    weight = 1 - (now % window) / window
+    return previous * weight + current > limit
+
+
+def is_limited(scope, keys, rules):
+    """Apply every rule whose key is present, e.g. keys={'ip': ..., 'username': ...}."""
+    limited = False
+    for name, (limit, window) in rules.items():
+        if keys.get(name):
+            # No short-circuit: every counter keeps counting while a client is blocked
+            limited = hit(f'{scope}:{name}', keys[name], limit, window) or limited
+    return limited
+'''
+
+RATELIMIT_BENCH_COMMAND = '''\
+import logging
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+
+class Command(BaseCommand):
+    help = 'Measure the cost of accepted vs. throttled login attempts against a locmem cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=50)
+        parser.add_argument('--username', default='ratelimit-bench')
+
+    def handle(self, *args, **options):
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'ratelimit-bench'}}
+        timings = {200: [], 429: []}
+        # Every throttled request would otherwise log a 'Too Many Requests' warning
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        with override_settings(CACHES=locmem, ALLOWED_HOSTS=['*']):
+            client = Client()
+            url = reverse('accounts:login')
+            for _ in range(options['attempts']):
+                start = time.perf_counter()
+                response = client.post(url, {'username': options['username'], 'password': 'wrong-password'}, REMOTE_ADDR='203.0.113.7')
+                timings.setdefault(response.status_code, []).append(time.perf_counter() - start)
+        for status, label in [(200, 'accepted (password hashed)'), (429, 'throttled')]:
+            samples = timings.get(status) or [0]
+            self.stdout.write(f'{label:<28} {len(timings.get(status, [])):>5} requests  median {statistics.median(samples) * 1000:8.2f} ms')
+        if timings[200] and timings[429]:
+            ratio = statistics.median(timings[200]) / statistics.median(timings[429])
+            self.stdout.write(f'A throttled attempt costs {ratio:.0f}x less than a hashed one.')
+'''
+
+IMPORT_USERS_COMMAND = '''\
+import csv
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+
+def init_worker(settings_module):
+    # Spawned workers start empty: configure Django once per process (hashers read settings)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        'Import users from a CSV (username,email,password,first_name,last_name,groups). '
+        'Passwords are hashed in a process pool and users inserted with bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows read, hashed and inserted together')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Hashing processes')
+        parser.add_argument('--delimiter', default=',')
+        parser.add_argument('--group', action='append', default=[], help='Group added to every imported user (repeatable)')
+
+    def handle(self, *args, **options):
+        # Model imports stay out of module scope: spawned hashing workers import this module before django.setup()
+        from django.contrib.auth.models import Group
+
+        if not os.path.exists(options['csv_path']):
+            raise CommandError(f"File not found: {options['csv_path']}")
+        User = get_user_model()
+        groups = Group.objects.in_bulk(field_name='name')
+        missing = [name for name in options['group'] if name not in groups]
+        if missing:
+            raise CommandError(f"Unknown group(s): {', '.join(missing)}")
+
+        self.User, self.groups, self.default_groups = User, groups, options['group']
+        self.workers = max(1, options['workers'])
+        self.seen, self.unknown_groups = set(), set()
+        stats = {'created': 0, 'existing': 0, 'duplicate': 0, 'invalid': 0}
+        batch_size = max(1, options['batch_size'])
+        start = time.perf_counter()
+
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context,
+            initializer=init_worker, initargs=(os.environ['DJANGO_SETTINGS_MODULE'],),
+        ) as pool, open(options['csv_path'], newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f, delimiter=options['delimiter'])
+            if 'username' not in (reader.fieldnames or []):
+                raise CommandError("The CSV needs a 'username' column.")
+            # Streamed: only batch_size rows are held in memory at a time
+            while True:
+                rows = list(islice(reader, batch_size))
+                if not rows:
+                    break
+                self.import_batch(rows, pool, stats)
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f"  {stats['created']} users created ({stats['created'] / elapsed:.0f}/s)")
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {stats['created']} users in {elapsed:.1f}s ({stats['created'] / max(elapsed, 1e-9):.0f}/s). "
+            f"Skipped: {stats['existing']} existing, {stats['duplicate']} duplicated in file, {stats['invalid']} without username."
+        ))
+        if self.unknown_groups:
+            self.stdout.write(self.style.WARNING(f"Unknown groups ignored: {', '.join(sorted(self.unknown_groups))}"))
+
+    def import_batch(self, rows, pool, stats):
+        User = self.User
+        candidates = []
+        for row in rows:
+            username = User.normalize_username((row.get('username') or '').strip())
+            if not username:
+                stats['invalid'] += 1
+            elif username in self.seen:
+                stats['duplicate'] += 1
+            else:
+                self.seen.add(username)
+                candidates.append((username, row))
+
+        # One set-based lookup per batch instead of one exists() per row
+        existing = set(User.objects.filter(username__in=[u for u, _ in candidates]).values_list('username', flat=True))
+        stats['existing'] += len(existing)
+        candidates = [(u, row) for u, row in candidates if u not in existing]
+        if not candidates:
+            return
+
+        # Hashing dominates: spread it over the pool, a few chunks per worker
+        passwords = [row.get('password') or None for _, row in candidates]
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        hashes = list(pool.map(make_password, passwords, chunksize=chunksize))
+
+        users = [
+            User(
+                username=username,
+                email=User.objects.normalize_email((row.get('email') or '').strip()),
+                first_name=(row.get('first_name') or '').strip(),
+                last_name=(row.get('last_name') or '').strip(),
+                password=password_hash,
+            )
+            for (username, row), password_hash in zip(candidates, hashes)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            # Re-read the ids: bulk_create does not return them on every database
+            ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'pk'))
+            Membership = User.groups.through
+            user_field = f'{User._meta.model_name}_id'
+            memberships = []
+            for username, row in candidates:
+                names = [n.strip() for n in (row.get('groups') or '').replace('|', ';').split(';') if n.strip()]
+                for name in set(names + self.default_groups):
+                    if name in self.groups:
+                        memberships.append(Membership(**{user_field: ids[username], 'group_id': self.groups[name].pk}))
+                    else:
+                        self.unknown_groups.add(name)
+            Membership.objects.bulk_create(memberships, ignore_conflicts=True)
+        stats['created'] += len(users)
+'''
+
+@traced
+def generate_test_settings(project_name):
+    path = os.path.join(project_name, 'settings_test.py')
+    content = textwrap.dedent(f"""\
+        \"\"\"Settings for tests and CI: fast hashing, in-memory email, per-process cache.
+
+            python manage.py test --settings={project_name}.settings_test
+        \"\"\"
+        from .settings import *  # noqa: F401,F403
+
+        # MD5 is only acceptable here: users created in tests cost microseconds instead of PBKDF2's ~300 ms
+        PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+        EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        ACCOUNTS_OUTBOX_SEND_NOW = True
+
+        CACHES = {{
+            'default': {{'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        }}
+        ACCOUNTS_LOGIN_RATE_LIMITS = {{'ip': (10000, 60), 'username': (10000, 60)}}
+        ACCOUNTS_OTP_RATE_LIMITS = {{'ip': (10000, 60), 'user': (10000, 60)}}
+    """)
+    with open(path, 'w') as f:
+        f.write(content)
+    print_success(f"Generated {project_name}/settings_test.py (fast hasher, locmem email and cache)")
+
+# --calibrate-hashers: Django hasher class, module to import, pip package
+HASHER_PROFILES = {
+    'argon2': ('Argon2PasswordHasher', 'argon2', 'argon2-cffi'),
+    'bcrypt': ('BCryptSHA256PasswordHasher', 'bcrypt', 'bcrypt'),
+}
+
+def time_hasher(hasher, runs=3):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        hasher.encode('calibration-password', hasher.salt())
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[len(samples) // 2] * 1000
+
+def calibrate_params(algorithm, base, target_ms, timer=time_hasher):
+    """Raise the work factor from the base hasher's defaults while a hash stays under target_ms; never go below them."""
+    if algorithm == 'argon2':
+        # Keep Django's memory_cost/parallelism and only raise time_cost
+        params = {'time_cost': base.time_cost, 'memory_cost': base.memory_cost, 'parallelism': base.parallelism}
+        key, limit = 'time_cost', 10
+    else:
+        params = {'rounds': base.rounds}
+        key, limit = 'rounds', 16
+    elapsed = timer(type('Probe', (base,), params)())
+    print(f"    {', '.join(f'{k}={v}' for k, v in params.items()):<36} {elapsed:>8.1f} ms (Django default)")
+    if elapsed > target_ms:
+        print_warning(f"Django's defaults already take {elapsed:.0f} ms here (> {target_ms} ms): keeping them.")
+        return params
+    while params[key] < limit:
+        candidate = dict(params, **{key: params[key] + 1})
+        elapsed = timer(type('Probe', (base,), candidate)())
+        print(f"    {', '.join(f'{k}={v}' for k, v in candidate.items()):<36} {elapsed:>8.1f} ms")
+        if elapsed > target_ms:
+            break
+        params = candidate
+    return params
+
+def write_hashers_module(project_name, algorithm, params, target_ms):
+    class_name = HASHER_PROFILES[algorithm][0]
+    attrs = "\n".join(f"    {key} = {value}" for key, value in params.items())
+    hashers_path = os.path.join(project_name, 'hashers.py')
+    with open(hashers_path, 'w') as f:
+        f.write(
+            f'"""Password hashers calibrated on this machine (django-auth-cli.py --calibrate-hashers {algorithm}, '
+            f'target {target_ms} ms)."""\n'
+            f"from django.contrib.auth.hashers import {class_name}\n\n\n"
+            f"class Calibrated{class_name}({class_name}):\n{attrs}\n"
+        )
+    return hashers_path
+
+def calibrate_hashers(algorithm, target_ms=250):
+    """Measure on this machine and write <project>/hashers.py with the largest work factor under target_ms."""
+    if algorithm not in HASHER_PROFILES:
+        print_error(f"Unknown algorithm '{algorithm}'. Choose: {', '.join(HASHER_PROFILES)}")
+        sys.exit(1)
+    class_name, module, package = HASHER_PROFILES[algorithm]
+    try:
+        __import__(module)
+    except ImportError:
+        print_error(f"{package} is not installed. Run: pip install {package}")
+        sys.exit(1)
+
+    setup_django()
+    from django.contrib.auth import hashers as django_hashers
+
+    print_info(f"Calibrating {algorithm} for ~{target_ms} ms per hash on this machine...")
+    print(f"    {'PBKDF2 (current default)':<36} {time_hasher(django_hashers.PBKDF2PasswordHasher()):>8.1f} ms")
+    params = calibrate_params(algorithm, getattr(django_hashers, class_name), target_ms)
+
+    project_name = get_project_name()
+    hashers_path = write_hashers_module(project_name, algorithm, params, target_ms)
+    print_success(f"Wrote {hashers_path}: {', '.join(f'{k}={v}' for k, v in params.items())}")
+
+    # Existing PBKDF2 hashes keep verifying and are re-hashed with the new hasher at the next login
+    hasher_list = [f'{project_name}.hashers.Calibrated{class_name}'] + [
+        f'django.contrib.auth.hashers.{name}' for name in (
+            'PBKDF2PasswordHasher', 'PBKDF2SHA1PasswordHasher', 'Argon2PasswordHasher',
+            'BCryptSHA256PasswordHasher', 'ScryptPasswordHasher',
+        ) if name != class_name
+    ]
+    block = "PASSWORD_HASHERS = [\n" + "".join(f"    '{h}',\n" for h in hasher_list) + "]\n"
+    settings_path = os.path.join(project_name, 'settings.py')
+    with open(settings_path, 'r') as f:
+        content = f.read()
+    if re.search(r"^PASSWORD_HASHERS = \[.*?^\]\n", content, flags=re.M | re.S):
+        content = re.sub(r"^PASSWORD_HASHERS = \[.*?^\]\n", lambda m: block, content, flags=re.M | re.S)
+    else:
+        content += "\n" + block
+    with open(settings_path, 'w') as f:
+        f.write(content)
+    print_success(f"Configured PASSWORD_HASHERS in settings.py (first: Calibrated{class_name}).")
+    print_info(f"Install {package} on the server too (requirements.txt).")
+
+@traced
+def generate_import_users(app_name):
+    with open(os.path.join(ensure_commands_dir(app_name), 'import_users.py'), 'w') as f:
+        f.write(IMPORT_USERS_COMMAND)
+    print_success("Generated the import_users command")
+
+@traced
+def generate_ratelimit(app_name):
+    with open(os.path.join(app_name, 'ratelimit.py'), 'w') as f:
+        f.write(RATELIMIT_MODULE)
+    with open(os.path.join(ensure_commands_dir(app_name), 'ratelimit_bench.py'), 'w') as f:
+        f.write(RATELIMIT_BENCH_COMMAND)
+    print_success("Generated ratelimit.py and the ratelimit_bench command")
+
+@traced
+def generate_otp(app_name):
+    with open(os.path.join(app_name, 'otp.py'), 'w') as f:
+        f.write(OTP_MODULE)
+    print_success("Generated otp.py (cache and database OTP stores)")
+
+@traced
+def generate_outbox(app_name):
+    with open(os.path.join(app_name, 'outbox.py'), 'w') as f:
+        f.write(OUTBOX_MODULE)
+    with open(os.path.join(ensure_commands_dir(app_name), 'send_outbox.py'), 'w') as f:
+        f.write(SEND_OUTBOX_COMMAND)
+    print_success("Generated outbox.py and the send_outbox command")
+
+def print_outbox_schedule():
+    print_info("Queued emails (welcome, OTP) are sent by 'send_outbox'. Run it every minute, e.g. with cron:")
+    print(f"    * * * * * cd {os.getcwd()} && {sys.executable} manage.py send_outbox")
+    print_info("(Or keep one worker running: manage.py send_outbox --loop.)")
+
+@traced
 def generate_admin(app_name):
     path = os.path.join(app_name, 'admin.py')
     content = textwrap.dedent("""\
         from django.contrib import admin
         from django.contrib.auth.admin import UserAdmin
-        from .models import CustomUser
+        from .models import CustomUser, OutboxEmail
 
         class CustomUserAdmin(UserAdmin):
             fieldsets = UserAdmin.fieldsets + (
-                ('Custom Fields', {'fields': ('photo_profil', 'otp_code', 'otp_created_at')}),
+                ('Custom Fields', {'fields': ('photo_profil', 'otp_code', 'otp_created_at', 'otp_attempts')}),
             )
             add_fieldsets = UserAdmin.add_fieldsets + (
                 ('Custom Fields', {'fields': ('photo_profil', 'otp_code', 'otp_created_at')}),
             )
 
         admin.site.register(CustomUser, CustomUserAdmin)
+
+        @admin.register(OutboxEmail)
+        class OutboxEmailAdmin(admin.ModelAdmin):
+            list_display = ('subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+            list_filter = ('status',)
+            search_fields = ('recipients', 'subject')
     """)
     with open(path, 'w') as f:
         f.write(content)
     print_success("Generated admin.py with CustomUser registration")
 
 
+@traced
 def generate_signals(app_name, default_group, project_name, use_welcome_email=True):
     path = os.path.join(app_name, 'signals.py')
     
     email_logic = ""
     if use_welcome_email:
         email_logic = textwrap.dedent(f"""
-            # Logic for Welcome Email
-            from django.core.mail import send_mail
-            from django.conf import settings
-            
-            subject = 'Bienvenue sur {project_name}'
-            message = f'Bonjour {{instance.username}}, merci de vous être inscrit !'
-            try:
-                send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [instance.email])
-            except Exception as e:
-                print(f"Error sending email: {{e}}")
+            # Welcome Email: queued in the outbox, delivered by 'manage.py send_outbox'
+            if instance.email:
+                enqueue_email(
+                    'Bienvenue sur {project_name}',
+                    f'Bonjour {{instance.username}}, merci de vous être inscrit !',
+                    [instance.email],
+                )
         """)
 
     content = textwrap.dedent(f"""\
-        from django.db.models.signals import post_save
+        from django.db.models.signals import m2m_changed, post_delete, post_save
         from django.dispatch import receiver
         from django.contrib.auth.models import Group
         from .models import CustomUser
+        from .outbox import enqueue_email
+        from .roles import invalidate_all, invalidate_user
+
+        ROLE_ACTIONS = ('post_add', 'post_remove', 'post_clear')
+
+        @receiver(m2m_changed, sender=CustomUser.groups.through)
+        @receiver(m2m_changed, sender=CustomUser.user_permissions.through)
+        def invalidate_user_roles(sender, instance, action, reverse, **kwargs):
+            if action in ROLE_ACTIONS:
+                # reverse: group.user_set changed, the affected users are not all known here
+                invalidate_all() if reverse else invalidate_user(instance.pk)
+
+        @receiver(m2m_changed, sender=Group.permissions.through)
+        def invalidate_group_permissions(sender, action, **kwargs):
+            if action in ROLE_ACTIONS:
+                invalidate_all()
+
+        @receiver(post_save, sender=Group)
+        @receiver(post_delete, sender=Group)
+        def invalidate_group(sender, **kwargs):
+            invalidate_all()
+
+        @receiver(post_save, sender=CustomUser)
+        def invalidate_user_flags(sender, instance, created, **kwargs):
+            # is_superuser / is_active feed the cached permission set; logins only touch last_login
+            update_fields = kwargs.get('update_fields')
+            if not created and not (update_fields and set(update_fields) <= {{'last_login'}}):
+                invalidate_user(instance.pk)
 
         @receiver(post_save, sender=CustomUser)
         def assign_default_group(sender, instance, created, **kwargs):
@@ -225,73 +1216,99 @@ def generate_signals(app_name, default_group, project_name, use_welcome_email=Tr
             f.write(apps_content)
         print_success("Updated apps.py to load signals.")
 
-def init_groups(create_users=False):
-    print_info("Bootstrapping groups, permissions, and users...")
+# Role definitions: {"Group": {"all": true} | {"permissions": ["codename" or "app_label.codename", ...]}}
+DEFAULT_ROLES = {
+    'Admin_Site': {'all': True},
+    'Manager': {
+        'permissions': ['view_customuser', 'change_customuser', 'add_customuser'],
+    },
+    'Membre': {
+        'permissions': ['view_customuser'],
+    },
+}
+
+def load_roles(argv):
+    """Strip --roles file.json from argv; the roles can also come from the answers file."""
+    roles = ANSWERS.get('roles')
+    roles_path = pop_option(argv, '--roles')
+    if roles_path:
+        with open(roles_path, 'r') as f:
+            roles = json.load(f)
+    return argv, roles or DEFAULT_ROLES
+
+@traced
+def setup_django():
     project_name = get_project_name()
-    init_script = textwrap.dedent(f"""
-        import os
-        import django
-
-        os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{project_name}.settings')
-
-        django.setup()
-
-        from django.contrib.auth import get_user_model
-        from django.contrib.auth.models import Group, Permission
-        from django.contrib.contenttypes.models import ContentType
-
-        User = get_user_model()
-
-        # 1. Groups & Permissions
-        groups = {{
-            'Admin_Site': {{'all': True}},
-            'Manager': {{
-                'permissions': [
-                    'view_customuser', 'change_customuser', 'add_customuser',
-                ],
-            }},
-            'Membre': {{
-                'permissions': ['view_customuser'],
-            }}
-        }}
-
-        for group_name, config in groups.items():
-            group, created = Group.objects.get_or_create(name=group_name)
-            if created:
-                print(f"Created group: {{group_name}}")
-            
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', f'{project_name}.settings')
+    import django
+    django.setup()
+
+@traced
+def init_groups(create_users=False, roles=None):
+    print_info("Bootstrapping groups, permissions, and users...")
+    roles = roles or DEFAULT_ROLES
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group, Permission
+    from django.db import connection, transaction
+    from django.test.utils import CaptureQueriesContext
+
+    User = get_user_model()
+
+    with CaptureQueriesContext(connection) as queries, transaction.atomic():
+        # 1. Groups: one read, one bulk insert for the missing ones, one re-read for their ids
+        existing = set(Group.objects.filter(name__in=roles).values_list('name', flat=True))
+        missing = [name for name in roles if name not in existing]
+        if missing:
+            Group.objects.bulk_create([Group(name=name) for name in missing])
+            for name in missing:
+                print(f"Created group: {name}")
+        groups = {g.name: g for g in Group.objects.filter(name__in=roles)}
+
+        # 2. Permissions: a single query for every codename used by any role
+        codenames = {code.split('.')[-1] for config in roles.values() for code in config.get('permissions', [])}
+        by_code = {}
+        for pk, app_label, codename in Permission.objects.filter(codename__in=codenames).values_list('pk', 'content_type__app_label', 'codename'):
+            by_code.setdefault(codename, []).append(pk)
+            by_code[f'{app_label}.{codename}'] = [pk]
+        all_perms = None
+
+        for group_name, config in roles.items():
+            group = groups[group_name]
             if config.get('all'):
-                all_perms = Permission.objects.all()
+                if all_perms is None:
+                    all_perms = list(Permission.objects.values_list('pk', flat=True))
                 group.permissions.set(all_perms)
-            else:
-                for perm_code in config.get('permissions', []):
-                    try:
-                        perm = Permission.objects.get(codename=perm_code)
-                        group.permissions.add(perm)
-                    except Permission.DoesNotExist:
-                        pass
-        
-        # 2. Users (if requested)
-        if {create_users}:
+                continue
+            perms = []
+            for code in config.get('permissions', []):
+                if code not in by_code:
+                    print_warning(f"Unknown permission '{code}' for group {group_name}.")
+                perms += by_code.get(code, [])
+            if perms:
+                group.permissions.add(*perms)
+
+        # 3. Users (if requested)
+        if create_users:
             # Superuser
             if not User.objects.filter(username='superuser').exists():
                 User.objects.create_superuser('superuser', 'superuser@mail.com', 'geonidas')
                 print("Created Superuser: superuser / geonidas")
-            
+
             # Admin User
-            if not User.objects.filter(username='admin').exists():
+            if 'Admin_Site' not in groups:
+                print_warning("No 'Admin_Site' role in the roles definition: the 'admin' test user was not created.")
+            elif not User.objects.filter(username='admin').exists():
                 u = User.objects.create_user('admin', 'admin@mail.com', 'geonidas')
-                g = Group.objects.get(name='Admin_Site')
-                u.groups.add(g)
+                u.groups.add(groups['Admin_Site'])
                 print("Created Admin User: admin / geonidas (Role: Admin_Site)")
-        
-        print("Groups and Users initialization complete.")
-    """)
-    with open('init_auth.py', 'w') as f:
-        f.write(init_script)
-    run_command(f"{sys.executable} init_auth.py")
-    os.remove('init_auth.py')
 
+    print_success(f"Groups and Users initialization complete ({len(roles)} roles, {len(queries)} queries).")
+
+@traced
 def generate_forms(app_name):
     path = os.path.join(app_name, 'forms.py')
     content = textwrap.dedent("""\
@@ -322,7 +1339,26 @@ def generate_forms(app_name):
                     'groups': forms.CheckboxSelectMultiple(),
                 }
 
+        from django.conf import settings
         from django.contrib.auth.models import Group, Permission
+        from django.db.models import Count
+
+        def permission_choices(app_label=None):
+            \"\"\"Permissions as ('app | model', [(pk, name), ...]) groups, read in one joined query.\"\"\"
+            permissions = Permission.objects.order_by('content_type__app_label', 'content_type__model', 'codename')
+            if app_label:
+                permissions = permissions.filter(content_type__app_label=app_label)
+            choices = {}
+            for pk, name, app, model in permissions.values_list('pk', 'name', 'content_type__app_label', 'content_type__model'):
+                choices.setdefault(f'{app} | {model}', []).append((pk, name))
+            return list(choices.items())
+
+        def permission_sections():
+            return list(
+                Permission.objects.values_list('content_type__app_label')
+                .annotate(total=Count('id')).order_by('content_type__app_label')
+            )
+
         class GroupForm(forms.ModelForm):
             permissions = forms.ModelMultipleChoiceField(
                 queryset=Permission.objects.all(),
@@ -332,12 +1368,31 @@ def generate_forms(app_name):
             class Meta:
                 model = Group
                 fields = ['name', 'permissions']
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                # Lazy mode: one collapsed section per app, loaded on demand from the JSON endpoint
+                self.lazy_permissions = getattr(settings, 'ACCOUNTS_LAZY_PERMISSIONS', False)
+                if self.lazy_permissions:
+                    self.permission_sections = permission_sections()
+                else:
+                    self.fields['permissions'].choices = permission_choices()
+
+            def clean_permissions(self):
+                permissions = self.cleaned_data['permissions']
+                if not self.lazy_permissions or not self.instance.pk:
+                    return permissions
+                # Sections never opened were not submitted: keep what the group already has there
+                loaded = self.data.getlist('loaded_sections')
+                kept = self.instance.permissions.exclude(content_type__app_label__in=loaded)
+                return list(permissions) + list(kept)
     """)
     with open(path, 'w') as f:
         f.write(content)
     print_success("Generated forms.py")
 
-def generate_views(app_name, use_landing=True, use_2fa=False):
+@traced
+def generate_views(app_name, project_name, use_landing=True, use_2fa=False):
     path = os.path.join(app_name, 'views.py')
     
     parts = []
@@ -345,62 +1400,79 @@ def generate_views(app_name, use_landing=True, use_2fa=False):
         from django.shortcuts import render, redirect, get_object_or_404
         from django.contrib.auth.decorators import login_required, user_passes_test
         from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-        from django.views.generic import ListView, UpdateView, TemplateView, CreateView
+        from django.views.generic import ListView, UpdateView, TemplateView, CreateView, View
+        from django.http import JsonResponse
         from django.urls import reverse_lazy
         from .models import CustomUser
-        from .forms import CustomUserCreationForm, ProfileUpdateForm, UserAdminForm, GroupForm
+        from .forms import CustomUserCreationForm, ProfileUpdateForm, UserAdminForm, GroupForm, permission_choices
+        from .outbox import enqueue_email
         from django.contrib import messages
         from django.contrib.auth.models import Group, Permission
+        from django.db.models import Prefetch, Q
+    """))
+
+    parts.append(textwrap.dedent("""\
+        from django.contrib.auth.views import LoginView
+        from .ratelimit import LOGIN_RATE_LIMITS, OTP_RATE_LIMITS, client_ip, is_limited
+
+        class ThrottledLoginView(LoginView):
+            \"\"\"LoginView that answers 429 before the password hasher runs once a limit is hit.\"\"\"
+            template_name = 'accounts/login.html'
+
+            def post(self, request, *args, **kwargs):
+                keys = {'ip': client_ip(request), 'username': request.POST.get('username', '').strip().lower()}
+                if is_limited('login', keys, LOGIN_RATE_LIMITS):
+                    response = self.render_to_response(self.get_context_data(throttled=True), status=429)
+                    response['Retry-After'] = str(max(window for _, window in LOGIN_RATE_LIMITS.values()))
+                    return response
+                return super().post(request, *args, **kwargs)
     """))
 
     if use_2fa:
         parts.append(textwrap.dedent("""\
-            import random
-            from django.utils import timezone
-            from django.core.mail import send_mail
             from django.contrib.auth import login as auth_login
-            from django.contrib.auth.views import LoginView
             from django.contrib import messages
+            from .otp import get_otp_store
 
-            class CustomLoginView(LoginView):
-                template_name = 'accounts/login.html'
+            class CustomLoginView(ThrottledLoginView):
                 
                 def form_valid(self, form):
                     user = form.get_user()
-                    otp = str(random.randint(100000, 999999))
-                    user.otp_code = otp
-                    user.otp_created_at = timezone.now()
-                    user.save()
-                    
-                    try:
-                        send_mail(
-                            'Code de sécurité {project_name}',
-                            f'Votre code est : {otp}',
-                            None,
-                            [user.email],
-                            fail_silently=False,
-                        )
-                        self.request.session['pre_otp_user_id'] = user.id
-                        return redirect('accounts:verify_otp')
-                    except Exception as e:
-                        messages.error(self.request, f"Erreur Email : {e}")
-                        return super().form_invalid(form)
+                    if not user.email:
+                        form.add_error(None, "Aucune adresse email n'est associée à ce compte : impossible d'envoyer le code. Contactez un administrateur.")
+                        return self.render_to_response(self.get_context_data(form=form, missing_email=True))
+                    otp = get_otp_store().issue(user.pk)
+
+                    # Queued: SMTP latency stays out of the login request
+                    enqueue_email('Code de sécurité {project_name}', f'Votre code est : {otp}', [user.email])
+                    self.request.session['pre_otp_user_id'] = user.id
+                    return redirect('accounts:verify_otp')
 
             def verify_otp(request):
                 user_id = request.session.get('pre_otp_user_id')
                 if not user_id: return redirect('accounts:login')
                 if request.method == 'POST':
-                    otp = request.POST.get('otp')
-                    user = CustomUser.objects.filter(id=user_id).first()
-                    if user and user.otp_code == otp:
+                    if is_limited('otp', {'ip': client_ip(request), 'user': str(user_id)}, OTP_RATE_LIMITS):
+                        return render(request, 'accounts/verify_otp.html', {'throttled': True}, status=429)
+                    otp = request.POST.get('otp', '').strip()
+                    user = CustomUser.objects.filter(id=user_id).first() if get_otp_store().verify(user_id, otp) else None
+                    if user:
                         auth_login(request, user)
                         del request.session['pre_otp_user_id']
                         return redirect('accounts:dashboard')
-                    messages.error(request, "Code invalide.")
+                    messages.error(request, "Code invalide ou expiré.")
                 return render(request, 'accounts/verify_otp.html')
-        """))
+        """).replace('{project_name}', project_name))
 
     parts.append(textwrap.dedent("""\
+        class RoleRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
+            \"\"\"Allow superusers and members of allowed_roles, checked against the role cache.\"\"\"
+            allowed_roles = ()
+
+            def test_func(self):
+                user = self.request.user
+                return user.is_superuser or not user.role_names.isdisjoint(self.allowed_roles)
+
         class LandingView(TemplateView):
             template_name = 'accounts/landing.html'
 
@@ -410,18 +1482,56 @@ def generate_views(app_name, use_landing=True, use_2fa=False):
             def get_context_data(self, **kwargs):
                 context = super().get_context_data(**kwargs)
                 user = self.request.user
-                context['is_admin'] = user.groups.filter(name='Admin_Site').exists() or user.is_superuser
-                context['is_manager'] = user.groups.filter(name='Manager').exists()
-                context['is_membre'] = user.groups.filter(name='Membre').exists()
+                roles = user.role_names
+                context['role_names'] = roles
+                context['is_admin'] = 'Admin_Site' in roles or user.is_superuser
+                context['is_manager'] = 'Manager' in roles
+                context['is_membre'] = 'Membre' in roles
                 return context
 
-        class UserManagementListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+        class UserManagementListView(RoleRequiredMixin, ListView):
             model = CustomUser
             template_name = 'accounts/user_list.html'
             context_object_name = 'users'
+            allowed_roles = ('Admin_Site', 'Manager')
+            paginate_by = 50
+            list_fields = ('id', 'username', 'email', 'photo_profil', 'is_active', 'is_superuser')
+
+            def get_queryset(self):
+                queryset = CustomUser.objects.only(*self.list_fields).prefetch_related(
+                    Prefetch('groups', queryset=Group.objects.only('id', 'name'))
+                )
+                query = self.request.GET.get('q', '').strip()
+                if query:
+                    # Prefix match so the username/email indexes can be used
+                    queryset = queryset.filter(Q(username__startswith=query) | Q(email__istartswith=query))
+                return queryset.order_by('pk')
+
+            def paginate_queryset(self, queryset, page_size):
+                after = self.request.GET.get('after')
+                if after is None:
+                    return super().paginate_queryset(queryset, page_size)
+                # Keyset page (?after=<pk>): no COUNT(*) and no OFFSET, so a deep page costs the same as the first
+                try:
+                    after = int(after)
+                except ValueError:
+                    after = 0
+                rows = list(queryset.filter(pk__gt=after)[:page_size + 1])
+                has_next = len(rows) > page_size
+                rows = rows[:page_size]
+                self.next_after = rows[-1].pk if has_next else None
+                return (None, None, rows, has_next or after > 0)
 
-            def test_func(self):
-                return self.request.user.groups.filter(name__in=['Admin_Site', 'Manager']).exists() or self.request.user.is_superuser
+            def get_context_data(self, **kwargs):
+                context = super().get_context_data(**kwargs)
+                context['search_query'] = self.request.GET.get('q', '').strip()
+                page_obj = context.get('page_obj')
+                if page_obj is not None and page_obj.has_next():
+                    # "Suivant" leaves OFFSET pagination and continues by keyset from the last row shown
+                    context['next_after'] = page_obj[-1].pk
+                else:
+                    context['next_after'] = getattr(self, 'next_after', None)
+                return context
 
         class ProfileUpdateView(LoginRequiredMixin, UpdateView):
             model = CustomUser
@@ -433,20 +1543,16 @@ def generate_views(app_name, use_landing=True, use_2fa=False):
                 return self.request.user
 
         # --- USER CRUD (ADMIN/MANAGER) ---
-        class UserUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+        class UserUpdateView(RoleRequiredMixin, UpdateView):
             model = CustomUser
             form_class = UserAdminForm
             template_name = 'accounts/user_form.html'
             success_url = reverse_lazy('accounts:user_list')
+            allowed_roles = ('Admin_Site', 'Manager')
 
-            def test_func(self):
-                return self.request.user.groups.filter(name__in=['Admin_Site', 'Manager']).exists() or self.request.user.is_superuser
-
-        class UserDeleteView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+        class UserDeleteView(RoleRequiredMixin, TemplateView):
             template_name = 'accounts/user_confirm_delete.html'
-
-            def test_func(self):
-                return self.request.user.groups.filter(name='Admin_Site').exists() or self.request.user.is_superuser
+            allowed_roles = ('Admin_Site',)
 
             def post(self, request, pk):
                 user = CustomUser.objects.get(pk=pk)
@@ -458,31 +1564,43 @@ def generate_views(app_name, use_landing=True, use_2fa=False):
                 return redirect('accounts:user_list')
 
         # --- GROUP & PERMISSION MANAGEMENT (ADMIN ONLY) ---
-        class GroupListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+        class GroupListView(RoleRequiredMixin, ListView):
             model = Group
             template_name = 'accounts/group_list.html'
             context_object_name = 'groups'
+            allowed_roles = ('Admin_Site',)
 
-            def test_func(self):
-                return self.request.user.groups.filter(name='Admin_Site').exists() or self.request.user.is_superuser
-
-        class GroupCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
+        class GroupCreateView(RoleRequiredMixin, CreateView):
             model = Group
             form_class = GroupForm
             template_name = 'accounts/group_form.html'
             success_url = reverse_lazy('accounts:group_list')
+            allowed_roles = ('Admin_Site',)
 
-            def test_func(self):
-                return self.request.user.groups.filter(name='Admin_Site').exists() or self.request.user.is_superuser
-
-        class GroupUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+        class GroupUpdateView(RoleRequiredMixin, UpdateView):
             model = Group
             form_class = GroupForm
             template_name = 'accounts/group_form.html'
             success_url = reverse_lazy('accounts:group_list')
-
-            def test_func(self):
-                return self.request.user.groups.filter(name='Admin_Site').exists() or self.request.user.is_superuser
+            allowed_roles = ('Admin_Site',)
+
+        class GroupPermissionsJsonView(RoleRequiredMixin, View):
+            \"\"\"One app's permissions for the lazy group form (ACCOUNTS_LAZY_PERMISSIONS).\"\"\"
+            allowed_roles = ('Admin_Site',)
+
+            def get(self, request):
+                app_label = request.GET.get('app', '')
+                group_id = request.GET.get('group', '')
+                checked = set()
+                if group_id.isdigit():
+                    checked = set(Permission.objects.filter(
+                        group__pk=group_id, content_type__app_label=app_label
+                    ).values_list('pk', flat=True))
+                sections = [
+                    {'label': label, 'permissions': [{'id': pk, 'name': name, 'checked': pk in checked} for pk, name in perms]}
+                    for label, perms in permission_choices(app_label)
+                ]
+                return JsonResponse({'app': app_label, 'sections': sections})
 
         def register(request):
             if request.method == 'POST':
@@ -499,12 +1617,13 @@ def generate_views(app_name, use_landing=True, use_2fa=False):
         f.write("\n".join(p.strip() for p in parts) + "\n")
     print_success("Generated views.py")
 
+@traced
 def generate_urls(app_name, use_landing=True, admin_url='admin', use_2fa=False):
     path = os.path.join(app_name, 'urls.py')
     
     root_path_logic = "path('', views.LandingView.as_view(), name='landing')," if use_landing else "path('', views.DashboardView.as_view(), name='index_dashboard'),"
     
-    login_path = "path('login/', views.CustomLoginView.as_view(), name='login')," if use_2fa else "path('login/', auth_views.LoginView.as_view(template_name='accounts/login.html'), name='login'),"
+    login_path = "path('login/', views.CustomLoginView.as_view(), name='login')," if use_2fa else "path('login/', views.ThrottledLoginView.as_view(), name='login'),"
     otp_path = f"path('verify-otp/', views.verify_otp, name='verify_otp')," if use_2fa else ""
     
     content = textwrap.dedent(f"""\
@@ -530,6 +1649,7 @@ def generate_urls(app_name, use_landing=True, admin_url='admin', use_2fa=False):
             path('groups/', views.GroupListView.as_view(), name='group_list'),
             path('groups/add/', views.GroupCreateView.as_view(), name='group_add'),
             path('groups/<int:pk>/edit/', views.GroupUpdateView.as_view(), name='group_edit'),
+            path('groups/permissions.json', views.GroupPermissionsJsonView.as_view(), name='group_permissions_json'),
             
             # Auth Overrides
             {login_path}
@@ -575,6 +1695,112 @@ def generate_urls(app_name, use_landing=True, admin_url='admin', use_2fa=False):
     
     print_success("Generated urls.py and updated root urls.py")
 
+@traced
+def generate_thumbnails(app_name):
+    # Resized avatars for the navbar, profile and user list: <app>/thumbnails.py + {% load thumbnails %}
+    templatetags_dir = os.path.join(app_name, 'templatetags')
+    os.makedirs(templatetags_dir, exist_ok=True)
+    init_file = os.path.join(templatetags_dir, '__init__.py')
+    if not os.path.exists(init_file):
+        with open(init_file, 'w') as f:
+            f.write("")
+
+    thumbnails_code = textwrap.dedent("""
+    import hashlib
+    import os
+    import threading
+
+    from django.conf import settings
+    from django.core.files.storage import default_storage
+
+    THUMBNAIL_DIR = getattr(settings, 'THUMBNAIL_DIR', 'thumbs')
+    THUMBNAIL_QUALITY = getattr(settings, 'THUMBNAIL_QUALITY', 80)
+
+
+    def output_format():
+        from PIL import features
+        return 'WEBP' if features.check('webp') else 'JPEG'
+
+
+    def parse_size(spec):
+        # "64x64" fits inside the box, "64x64 crop" fills it (square avatars)
+        parts = str(spec).split()
+        width, height = (int(v) for v in parts[0].lower().split('x'))
+        return (width, height), 'crop' in parts[1:]
+
+
+    def thumbnail_name(name, size, crop, mtime, fmt):
+        # The original's mtime is part of the key: re-uploading under the same name yields a new file
+        key = hashlib.sha1(f'{name}:{size[0]}x{size[1]}:{crop}:{mtime}'.encode()).hexdigest()[:16]
+        base = os.path.splitext(os.path.basename(name))[0]
+        ext = 'webp' if fmt == 'WEBP' else 'jpg'
+        return f'{THUMBNAIL_DIR}/{key[:2]}/{base}-{size[0]}x{size[1]}-{key}.{ext}'
+
+
+    def render_thumbnail(source_path, dest_path, size, crop, fmt):
+        from PIL import Image, ImageOps
+
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with Image.open(source_path) as img:
+            img = ImageOps.exif_transpose(img)
+            if crop:
+                img = ImageOps.fit(img, size)
+            else:
+                img.thumbnail(size)
+            if fmt == 'JPEG' and img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+            # Per process and thread: two requests rendering the same thumbnail never share a temp file
+            tmp_path = f'{dest_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            img.save(tmp_path, fmt, quality=THUMBNAIL_QUALITY)
+        os.replace(tmp_path, dest_path)
+
+
+    def get_thumbnail_url(field_file, spec):
+        \"\"\"
+        URL of a resized copy of an ImageField file, generated on first request and then
+        served from MEDIA_ROOT/THUMBNAIL_DIR. Falls back to the original on any error.
+        \"\"\"
+        if not field_file:
+            return ''
+        try:
+            source_path = field_file.path
+            mtime = int(os.path.getmtime(source_path))
+        except (NotImplementedError, ValueError, OSError):
+            # Remote storage or missing file: nothing to resize locally
+            return field_file.url if field_file else ''
+
+        try:
+            size, crop = parse_size(spec)
+            fmt = output_format()
+            name = thumbnail_name(field_file.name, size, crop, mtime, fmt)
+            dest_path = os.path.join(settings.MEDIA_ROOT, name)
+            if not os.path.exists(dest_path):
+                render_thumbnail(source_path, dest_path, size, crop, fmt)
+        except Exception:
+            return field_file.url
+        return default_storage.url(name)
+    """)
+    with open(os.path.join(app_name, 'thumbnails.py'), 'w') as f:
+        f.write(thumbnails_code.strip() + "\n")
+
+    tags_code = textwrap.dedent("""
+    from django import template
+
+    from ..thumbnails import get_thumbnail_url
+
+    register = template.Library()
+
+
+    @register.filter
+    def thumbnail(image, spec='128x128'):
+        # {{ obj.photo|thumbnail:"64x64 crop" }}
+        return get_thumbnail_url(image, spec)
+    """)
+    with open(os.path.join(templatetags_dir, 'thumbnails.py'), 'w') as f:
+        f.write(tags_code.strip() + "\n")
+    print_success("Generated thumbnails.py and templatetags/thumbnails.py")
+
+@traced
 def generate_templates(app_name, project_name, use_landing=True):
     templates_dir = os.path.join(app_name, 'templates', 'accounts')
     os.makedirs(templates_dir, exist_ok=True)
@@ -660,6 +1886,7 @@ def generate_templates(app_name, project_name, use_landing=True):
     """)
 
     write_root('nav.html', """
+            {% load thumbnails %}
             <nav class="navbar navbar-expand-lg navbar-custom fixed-top">
                 <div class="container">
                     <a class="navbar-brand d-flex align-items-center" href="/">
@@ -683,7 +1910,7 @@ def generate_templates(app_name, project_name, use_landing=True):
                                     <i class="bi bi-people me-1"></i> Communauté
                                 </a>
                             </li>
-                            {% if user.is_superuser or user.groups.all %}
+                            {% if user.is_superuser or user.role_names %}
                             <li class="nav-item">
                                 <a class="nav-link {% if 'group' in request.resolver_match.url_name %}active{% endif %}" href="{% url 'accounts:group_list' %}">
                                     <i class="bi bi-shield-lock me-1"></i> Accès & Rôles
@@ -696,7 +1923,7 @@ def generate_templates(app_name, project_name, use_landing=True):
                             <div class="dropdown">
                                 <div class="user-pill d-flex align-items-center dropdown-toggle shadow-none border-0" data-bs-toggle="dropdown">
                                     {% if user.photo_profil %}
-                                        <img src="{{ user.photo_profil.url }}" class="rounded-circle me-2" width="32" height="32" style="object-fit: cover;">
+                                        <img src="{{ user.photo_profil|thumbnail:'64x64 crop' }}" class="rounded-circle me-2" width="32" height="32" style="object-fit: cover;">
                                     {% else %}
                                         <div class="avatar-circle me-2">{{ user.username|make_list|first|upper }}</div>
                                     {% endif %}
@@ -902,7 +2129,15 @@ def generate_templates(app_name, project_name, use_landing=True):
                             <p class="text-muted">Veuillez vous connecter à votre compte</p>
                         </div>
                         
-                        {% if form.errors %}
+                        {% if throttled %}
+                        <div class="alert alert-warning border-0 rounded-3">
+                            Trop de tentatives. Réessayez dans une minute.
+                        </div>
+                        {% elif missing_email %}
+                        <div class="alert alert-warning border-0 rounded-3">
+                            {{ form.non_field_errors|join:" " }}
+                        </div>
+                        {% elif form.errors %}
                         <div class="alert alert-danger border-0 rounded-3">
                             Identifiants invalides.
                         </div>
@@ -999,13 +2234,14 @@ def generate_templates(app_name, project_name, use_landing=True):
 
     write_t('profile.html', """
         {% extends 'base.html' %}
+        {% load thumbnails %}
         {% block content %}
         <div class="row">
             <div class="col-lg-8 mx-auto">
                 <div class="card p-4 shadow-sm border-0 rounded-4">
                     <div class="text-center mb-4">
                         {% if user.photo_profil %}
-                            <img src="{{ user.photo_profil.url }}" class="rounded-circle mb-3 shadow-sm object-fit-cover" width="100" height="100" style="border: 3px solid #e2e8f0;">
+                            <img src="{{ user.photo_profil|thumbnail:'200x200 crop' }}" class="rounded-circle mb-3 shadow-sm object-fit-cover" width="100" height="100" style="border: 3px solid #e2e8f0;">
                         {% else %}
                             <div class="bg-primary bg-opacity-10 d-inline-block p-3 rounded-circle mb-3">
                                 <i class="bi bi-person-circle text-primary fs-1"></i>
@@ -1082,6 +2318,7 @@ def generate_templates(app_name, project_name, use_landing=True):
 
     write_t('user_list.html', """
         {% extends 'base.html' %}
+        {% load thumbnails %}
         {% block title %}Gestion des Utilisateurs | {{ project_name }}{% endblock %}
         {% block content %}
         <div class="row mb-4 align-items-center">
@@ -1099,11 +2336,17 @@ def generate_templates(app_name, project_name, use_landing=True):
         </div>
 
         <div class="card border-0 shadow-sm rounded-4 overflow-hidden">
-            <div class="p-4 bg-white border-bottom d-flex justify-content-between align-items-center">
+            <div class="p-4 bg-white border-bottom d-flex flex-wrap gap-3 justify-content-between align-items-center">
                 <h5 class="fw-bold m-0"><i class="bi bi-people-fill text-primary me-2"></i>Liste des Membres</h5>
+                <form method="get" class="d-flex gap-2">
+                    <input type="search" name="q" value="{{ search_query }}" class="form-control form-control-sm rounded-pill" placeholder="Début du nom ou de l'email...">
+                    <button type="submit" class="btn btn-sm btn-light rounded-pill border px-3"><i class="bi bi-search"></i></button>
+                </form>
+                {% if paginator %}
                 <div class="badge bg-primary bg-opacity-10 text-primary border border-primary border-opacity-25 px-3 py-2 rounded-pill">
-                    {{ users.count }} Utilisateurs
+                    {{ paginator.count }} Utilisateurs
                 </div>
+                {% endif %}
             </div>
             <div class="table-responsive">
                 <table class="table table-hover align-middle mb-0">
@@ -1121,9 +2364,13 @@ def generate_templates(app_name, project_name, use_landing=True):
                         <tr>
                             <td class="ps-4">
                                 <div class="d-flex align-items-center">
+                                    {% if u.photo_profil %}
+                                    <img src="{{ u.photo_profil|thumbnail:'80x80 crop' }}" class="rounded-circle me-3" width="40" height="40" loading="lazy" style="object-fit: cover;">
+                                    {% else %}
                                     <div class="avatar-sm bg-primary bg-opacity-10 text-primary rounded-circle d-flex align-items-center justify-content-center fw-bold me-3" style="width: 40px; height: 40px;">
                                         {{ u.username|make_list|first|upper }}
                                     </div>
+                                    {% endif %}
                                     <div>
                                         <div class="fw-bold text-dark">{{ u.username }}</div>
                                         {% if u.is_superuser %}<span class="badge bg-danger bg-opacity-10 text-danger small px-2 rounded-pill">Superadmin</span>{% endif %}
@@ -1160,10 +2407,30 @@ def generate_templates(app_name, project_name, use_landing=True):
                                 </div>
                             </td>
                         </tr>
+                        {% empty %}
+                        <tr><td colspan="5" class="text-center text-muted py-5">Aucun utilisateur trouvé.</td></tr>
                         {% endfor %}
                     </tbody>
                 </table>
             </div>
+            {% if is_paginated %}
+            <div class="p-3 bg-white border-top d-flex justify-content-between align-items-center small">
+                {% if page_obj %}
+                    {% if page_obj.has_previous %}
+                    <a href="?{% if search_query %}q={{ search_query|urlencode }}&{% endif %}page={{ page_obj.previous_page_number }}" class="btn btn-sm btn-light rounded-pill border px-3"><i class="bi bi-chevron-left"></i> Précédent</a>
+                    {% else %}<span></span>{% endif %}
+                    <span class="text-secondary">Page {{ page_obj.number }} sur {{ paginator.num_pages }}</span>
+                    {% if page_obj.has_next %}
+                    <a href="?{% if search_query %}q={{ search_query|urlencode }}&{% endif %}after={{ next_after }}" class="btn btn-sm btn-light rounded-pill border px-3">Suivant <i class="bi bi-chevron-right"></i></a>
+                    {% else %}<span></span>{% endif %}
+                {% else %}
+                    <a href="?{% if search_query %}q={{ search_query|urlencode }}{% endif %}" class="btn btn-sm btn-light rounded-pill border px-3">Début</a>
+                    {% if next_after %}
+                    <a href="?{% if search_query %}q={{ search_query|urlencode }}&{% endif %}after={{ next_after }}" class="btn btn-sm btn-light rounded-pill border px-3">Suivant <i class="bi bi-chevron-right"></i></a>
+                    {% endif %}
+                {% endif %}
+            </div>
+            {% endif %}
         </div>
         <style> .table-hover tbody tr:hover { background-color: rgba(99, 102, 241, 0.02); } </style>
         {% endblock %}
@@ -1281,10 +2548,23 @@ def generate_templates(app_name, project_name, use_landing=True):
                         </div>
                         <div class="mb-4">
                             <label class="form-label fw-bold mb-3">Permissions associées</label>
+                            {% if form.lazy_permissions %}
+                            <div id="permission-sections" class="border rounded-3 p-3 overflow-auto" style="max-height: 400px; background: #f8f9fa;"
+                                 data-url="{% url 'accounts:group_permissions_json' %}" data-group="{{ object.pk|default:'' }}">
+                                {% for app_label, total in form.permission_sections %}
+                                <details class="mb-2" data-app="{{ app_label }}">
+                                    <summary class="fw-semibold">{{ app_label }} <span class="text-muted small">({{ total }})</span></summary>
+                                    <div class="ps-3 pt-2 small text-muted">Chargement...</div>
+                                </details>
+                                {% endfor %}
+                            </div>
+                            <div class="form-text mt-2"><i class="bi bi-info-circle me-1"></i>Ouvrez une application pour modifier ses permissions ; les autres restent inchangées.</div>
+                            {% else %}
                             <div class="border rounded-3 p-3 overflow-auto" style="max-height: 400px; background: #f8f9fa;">
                                 {{ form.permissions }}
                             </div>
-                            <div class="form-text mt-2"><i class="bi bi-info-circle me-1"></i>Maintenez Ctrl (ou Cmd) pour sélectionner plusieurs permissions si nécessaire.</div>
+                            <div class="form-text mt-2"><i class="bi bi-info-circle me-1"></i>Permissions regroupées par application et modèle.</div>
+                            {% endif %}
                         </div>
                         <div class="d-flex justify-content-end gap-2">
                             <a href="{% url 'accounts:group_list' %}" class="btn btn-light rounded-pill">Annuler</a>
@@ -1300,6 +2580,47 @@ def generate_templates(app_name, project_name, use_landing=True):
              li { margin-bottom: 5px; }
              label { cursor: pointer; }
         </style>
+        {% if form.lazy_permissions %}
+        <script>
+            document.querySelectorAll('#permission-sections details').forEach(function (section) {
+                section.addEventListener('toggle', function () {
+                    if (!section.open || section.dataset.loaded) return;
+                    section.dataset.loaded = '1';
+                    var box = document.getElementById('permission-sections');
+                    var params = new URLSearchParams({app: section.dataset.app, group: box.dataset.group});
+                    fetch(box.dataset.url + '?' + params).then(function (r) { return r.json(); }).then(function (data) {
+                        var body = section.querySelector('div');
+                        body.innerHTML = '';
+                        data.sections.forEach(function (group) {
+                            var title = document.createElement('div');
+                            title.className = 'fw-bold text-dark mt-2';
+                            title.textContent = group.label;
+                            body.appendChild(title);
+                            group.permissions.forEach(function (perm) {
+                                var label = document.createElement('label');
+                                var input = document.createElement('input');
+                                label.className = 'd-block text-dark';
+                                input.type = 'checkbox';
+                                input.name = 'permissions';
+                                input.value = perm.id;
+                                input.checked = perm.checked;
+                                input.className = 'form-check-input me-2';
+                                label.appendChild(input);
+                                label.appendChild(document.createTextNode(perm.name));
+                                body.appendChild(label);
+                            });
+                        });
+                        // Tells the form this app's checkboxes were submitted
+                        var marker = document.createElement('input');
+                        marker.type = 'hidden';
+                        marker.name = 'loaded_sections';
+                        marker.value = section.dataset.app;
+                        body.appendChild(marker);
+                    });
+                });
+            });
+        </script>
+        {% endif %}
         {% endblock %}
     """)
 
@@ -1312,6 +2633,9 @@ def generate_templates(app_name, project_name, use_landing=True):
             </div>
             <h3 class="fw-bold mb-3">Sécurité</h3>
             <p class="text-muted mb-4">Entrez le code reçu par email</p>
+            {% if throttled %}
+            <div class="alert alert-warning border-0 rounded-3">Trop de tentatives. Réessayez dans une minute.</div>
+            {% endif %}
             <form method="post">
                 {% csrf_token %}
                 <input type="text" name="otp" class="form-control form-control-lg text-center fw-bold mb-4" placeholder="000000" maxlength="6" autofocus required>
@@ -1325,7 +2649,21 @@ def generate_templates(app_name, project_name, use_landing=True):
 
 
 if __name__ == "__main__":
+    sys.argv[1:] = start_tracing(load_answers(sys.argv[1:]))
+    sys.argv[1:], roles = load_roles(sys.argv[1:])
     print(f"{Colors.HEADER}{Colors.BOLD}=== Django Auth CLI Setup ==={Colors.ENDC}")
+
+    # Standalone mode: python django-auth-cli.py --calibrate-hashers argon2|bcrypt [--target-ms 250]
+    if '--calibrate-hashers' in sys.argv:
+        i = sys.argv.index('--calibrate-hashers')
+        algorithm = sys.argv[i + 1] if i + 1 < len(sys.argv) else 'argon2'
+        target_ms = pop_option(sys.argv, '--target-ms', '250')
+        if not target_ms.isdigit() or int(target_ms) < 1:
+            print_error(f"--target-ms expects a positive number of milliseconds, got '{target_ms}'.")
+            sys.exit(1)
+        target_ms = int(target_ms)
+        calibrate_hashers(algorithm, target_ms)
+        sys.exit(0)
     
     # Dependency Check
     try:
@@ -1334,24 +2672,29 @@ if __name__ == "__main__":
         print_warning("Pillow is not installed. Profile photos will not work. Run: pip install Pillow")
 
     # Interactive Prompts
-    use_2fa = input(f"{Colors.OKBLUE}Add 2FA (Double Authentication)? (yes/no) [no]: {Colors.ENDC}").strip().lower() == 'yes'
-    welcome_email = input(f"{Colors.OKBLUE}Send welcome email on registration? (yes/no) [yes]: {Colors.ENDC}").strip().lower() != 'no'
-    create_test_users = input(f"{Colors.OKBLUE}Create default test users (superuser & admin)? (yes/no) [yes]: {Colors.ENDC}").strip().lower() != 'no'
-    use_landing = input(f"{Colors.OKBLUE}Add a public Landing Page? (yes/no) [yes]: {Colors.ENDC}").strip().lower() != 'no'
-    admin_url = input(f"{Colors.OKBLUE}Custom Admin URL path (e.g. 'secret-admin') [admin]: {Colors.ENDC}").strip() or 'admin'
+    use_2fa = ask('auth.2fa', f"{Colors.OKBLUE}Add 2FA (Double Authentication)? (yes/no) [no]: {Colors.ENDC}").strip().lower() == 'yes'
+    welcome_email = ask('auth.welcome_email', f"{Colors.OKBLUE}Send welcome email on registration? (yes/no) [yes]: {Colors.ENDC}").strip().lower() != 'no'
+    create_test_users = ask('auth.test_users', f"{Colors.OKBLUE}Create default test users (superuser & admin)? (yes/no) [yes]: {Colors.ENDC}").strip().lower() != 'no'
+    use_landing = ask('auth.landing', f"{Colors.OKBLUE}Add a public Landing Page? (yes/no) [yes]: {Colors.ENDC}").strip().lower() != 'no'
+    admin_url = ask('auth.admin_url', f"{Colors.OKBLUE}Custom Admin URL path (e.g. 'secret-admin') [admin]: {Colors.ENDC}").strip() or 'admin'
+
+    session_choice = ask('auth.sessions', f"{Colors.OKBLUE}Session backend (db/cached_db/cache) [cached_db]: {Colors.ENDC}").strip().lower() or 'cached_db'
+    if session_choice not in SESSION_ENGINES:
+        print_warning(f"Unknown session backend '{session_choice}', using 'cached_db'.")
+        session_choice = 'cached_db'
 
     print("\nAvailable default groups for new users:")
     print("1. Membre (Default)")
     print("2. Manager")
     print("3. Admin_Site")
-    group_choice = input(f"{Colors.OKBLUE}Choose default group (1/2/3) [1]: {Colors.ENDC}").strip()
+    group_choice = ask('auth.default_group', f"{Colors.OKBLUE}Choose default group (1/2/3) [1]: {Colors.ENDC}").strip()
     
     default_groups = { '1': 'Membre', '2': 'Manager', '3': 'Admin_Site' }
     default_group = default_groups.get(group_choice, 'Membre')
     
-    print(f"\n{Colors.OKCYAN}Config: 2FA={'ON' if use_2fa else 'OFF'}, WelcomeEmail={'ON' if welcome_email else 'OFF'}, DefaultGroup={default_group}{Colors.ENDC}\n")
+    print(f"\n{Colors.OKCYAN}Config: 2FA={'ON' if use_2fa else 'OFF'}, WelcomeEmail={'ON' if welcome_email else 'OFF'}, DefaultGroup={default_group}, Sessions={session_choice}{Colors.ENDC}\n")
     
-    confirm = input(f"{Colors.WARNING}Proceed with setup? (yes/no) [yes]: {Colors.ENDC}").strip().lower() != 'no'
+    confirm = ask('auth.confirm', f"{Colors.WARNING}Proceed with setup? (yes/no) [yes]: {Colors.ENDC}").strip().lower() != 'no'
     if not confirm:
         print_info("Setup cancelled.")
         sys.exit(0)
@@ -1359,14 +2702,22 @@ if __name__ == "__main__":
     # Execution phases
     project_name = get_project_name()
     app_name = 'accounts'
-    if setup_accounts_app(app_name, project_name):
+    if setup_accounts_app(app_name, project_name, session_choice):
         generate_models(app_name)
+        generate_roles(app_name)
         generate_admin(app_name)
+        generate_outbox(app_name)
+        generate_ratelimit(app_name)
+        generate_import_users(app_name)
+        generate_test_settings(project_name)
+        if use_2fa:
+            generate_otp(app_name)
         generate_signals(app_name, default_group, project_name, welcome_email)
         generate_forms(app_name)
-        generate_views(app_name, use_landing, use_2fa)
+        generate_views(app_name, project_name, use_landing, use_2fa)
         generate_urls(app_name, use_landing, admin_url, use_2fa)
         generate_templates(app_name, project_name, use_landing)
+        generate_thumbnails(app_name)
         
         print_info("Initializing groups (Database required)...")
         print_warning("Running makemigrations and migrate first...")
@@ -1384,7 +2735,7 @@ if __name__ == "__main__":
         if migration_error:
             print_error("Migration failed. This is often due to introducing a Custom User model in an existing database.")
             print_warning("Strategy: We can attempt a 'Deep Clean' (DELETE db.sqlite3 and all migrations) to start fresh.")
-            clean = input(f"{Colors.FAIL}Do you want to PERMANENTLY RESET the database and all migrations? (yes/no) [no]: {Colors.ENDC}").strip().lower() == 'yes'
+            clean = ask('auth.deep_clean', f"{Colors.FAIL}Do you want to PERMANENTLY RESET the database and all migrations? (yes/no) [no]: {Colors.ENDC}").strip().lower() == 'yes'
             
             if clean:
                 print_info("Deep cleaning project safely...")
@@ -1413,15 +2764,22 @@ if __name__ == "__main__":
                 print_error("Setup stopped due to migration errors.")
                 sys.exit(1)
         
-        init_groups(create_users=create_test_users)
+        init_groups(create_users=create_test_users, roles=roles)
         
         if use_2fa:
             print_info("2FA selected. Please install 'django-two-factor-auth' for full implementation.")
             print_info("Scaffolding for 2FA is conceptually ready in views (LoginRequiredMixin).")
 
+        print_clearsessions_schedule(session_choice)
+        bench = ask('auth.session_benchmark', f"{Colors.OKBLUE}Run a session backend micro-benchmark? (yes/no) [no]: {Colors.ENDC}").strip().lower() == 'yes'
+        if bench:
+            benchmark_sessions()
+
         if welcome_email:
             print_info("Welcome Email enabled. Remember to configure SMTP settings in settings.py.")
             print_info("Logic can be added to the post_save signal in accounts/signals.py.")
+        if welcome_email or use_2fa:
+            print_outbox_schedule()
 
         print(f"\n{Colors.OKGREEN}{Colors.BOLD}Setup Completed Successfully!{Colors.ENDC}")
         print_info(f"Login at: /accounts/login/")
@@ -1,11 +1,136 @@
 import os
 import sys
+import ast
+import importlib.metadata
+import urllib.request
 import django
 from django.conf import settings
 from django.apps import apps
+from django.db.models import ImageField
 import textwrap
 import subprocess
-
+import re
+import time
+import statistics
+import json
+import atexit
+import contextlib
+import functools
+import threading
+import gzip
+import hashlib
+import mimetypes
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# Answers for unattended runs: --answers file.json, DJANGO_CLI_<KEY> variables, --yes
+ANSWERS = {}
+ASSUME_DEFAULTS = False
+
+def load_answers(argv):
+    """Strip the global --answers/--yes flags from argv and load the answers file."""
+    global ASSUME_DEFAULTS
+    answers_path = pop_option(argv, '--answers', os.environ.get('DJANGO_CLI_ANSWERS'))
+    if answers_path:
+        with open(answers_path, 'r') as f:
+            ANSWERS.update(json.load(f))
+    ASSUME_DEFAULTS = pop_flag(argv, '--yes')
+    return argv
+
+def answer_text(value):
+    if isinstance(value, bool):
+        return 'yes' if value else 'no'
+    return str(value)
+
+def ask(key, prompt):
+    """input() that can be answered in advance; an empty answer selects the [default] shown in the prompt."""
+    env_name = 'DJANGO_CLI_' + re.sub(r"\W+", "_", key).upper()
+    if key in ANSWERS:
+        value = answer_text(ANSWERS[key])
+    elif env_name in os.environ:
+        value = os.environ[env_name]
+    elif ASSUME_DEFAULTS:
+        value = ''
+    else:
+        return input(prompt)
+    print(f"{prompt}{value}")
+    return value
+
+# Phase timings: --timings prints a summary at exit, --trace file.json writes Chrome trace events
+TRACE_EVENTS = []
+TRACE_ENABLED = False
+TRACE_ORIGIN = time.perf_counter()
+
+@contextlib.contextmanager
+def phase(name):
+    if not TRACE_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        TRACE_EVENTS.append({
+            'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+            'ts': (start - TRACE_ORIGIN) * 1e6, 'dur': (time.perf_counter() - start) * 1e6,
+        })
+
+def traced(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with phase(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+def phase_summary(events):
+    """Rows of (name, calls, total_us, self_us); self time excludes phases nested on the same thread."""
+    rows = {}
+    by_thread = {}
+    for event in events:
+        by_thread.setdefault(event['tid'], []).append(event)
+    for thread_events in by_thread.values():
+        thread_events.sort(key=lambda e: (e['ts'], -e['dur']))
+        stack = []
+        for event in thread_events:
+            while stack and event['ts'] >= stack[-1]['ts'] + stack[-1]['dur']:
+                stack.pop()
+            row = rows.setdefault(event['name'], [event['name'], 0, 0.0, 0.0])
+            row[1] += 1
+            row[2] += event['dur']
+            row[3] += event['dur']
+            if stack:
+                rows[stack[-1]['name']][3] -= event['dur']
+            stack.append(event)
+    return sorted(rows.values(), key=lambda row: row[3], reverse=True)
+
+def report_timings(trace_path=None, show_summary=True):
+    if trace_path:
+        with open(trace_path, 'w') as f:
+            json.dump({'traceEvents': TRACE_EVENTS, 'displayTimeUnit': 'ms'}, f)
+        print(f"\nTrace written to {trace_path} (open it in chrome://tracing or ui.perfetto.dev)")
+    if show_summary and TRACE_EVENTS:
+        print("\n" + "="*72)
+        print(f"{'Phase':<44} | {'Calls':>5} | {'Total (s)':>9} | {'Self (s)':>8}")
+        print("-"*72)
+        for name, calls, total, self_time in phase_summary(TRACE_EVENTS):
+            print(f"{name[:44]:<44} | {calls:>5} | {total / 1e6:>9.3f} | {self_time / 1e6:>8.3f}")
+        print("="*72)
+
+def start_tracing(argv):
+    """Strip the global --timings/--trace flags from argv and report at exit."""
+    global TRACE_ENABLED
+    trace_path = pop_option(argv, '--trace')
+    show_summary = pop_flag(argv, '--timings')
+    if trace_path or show_summary:
+        TRACE_ENABLED = True
+        atexit.register(report_timings, trace_path, show_summary)
+    return argv
+
+def run_subprocess(cmd, **kwargs):
+    # subprocess.check_call, recorded as its own phase
+    label = ' '.join(str(part) for part in cmd[1:]).splitlines()[0][:60]
+    with phase(f"subprocess: {label}"):
+        return subprocess.check_call(cmd, **kwargs)
 
 def get_project_name():
     # Try to find settings in likely locations
@@ -20,6 +145,7 @@ def get_project_name():
                 return item
     return 'my_django_project' # Fallback default
 
+@traced
 def setup_django():
     if not os.path.exists('manage.py'):
         print("Warning: manage.py not found. Ensure you are in the project root.")
@@ -38,11 +164,12 @@ def setup_django():
              print("Continuing, but some features might fail if they rely on the app registry.")
 
 
+@traced
 def ensure_app_exists(app_name):
     if not os.path.exists(app_name):
         print(f"App '{app_name}' does not exist. Creating it...")
         try:
-            subprocess.check_call([sys.executable, 'manage.py', 'startapp', app_name])
+            run_subprocess([sys.executable, 'manage.py', 'startapp', app_name])
             print(f"App '{app_name}' created.")
             
             project_name = get_project_name()
@@ -65,6 +192,7 @@ def ensure_app_exists(app_name):
             sys.exit(1)
     return True
 
+@traced
 def ensure_media_config(project_name=None):
     if not project_name:
         project_name = get_project_name()
@@ -120,6 +248,7 @@ def ensure_media_config(project_name=None):
         with open(urls_path, 'w') as f:
             f.write(urls_content)
 
+@traced
 def ensure_templates_config():
     project_name = get_project_name()
     settings_path = os.path.join(project_name, 'settings.py')
@@ -181,32 +310,47 @@ def ensure_templates_config():
             """))
         print("Created default 'templates/base.html'.")
 
-def get_fields_interactive(existing_model=False):
+def get_fields_interactive(existing_model=False, spec=None):
+    # spec: field dicts from the answers file, e.g. {"name": "title", "type": "string", "max_length": 120}
     fields_code = ""
+    pending = list(spec) if spec is not None else None
     print("\n" + "="*40)
     print(f"Add fields. Press <Enter> on 'property name' to stop.")
     print("="*40)
     
     if existing_model:
-        confirm = input("Model exists. Do you want to add more fields? (yes/no) [no]: ").strip().lower()
+        confirm = ask('model.add_fields', "Model exists. Do you want to add more fields? (yes/no) [no]: ").strip().lower()
         if confirm not in ['yes', 'y', 'true']:
              return ""
 
     while True:
-        field_name = input("\n> New property name (or press <Enter> to stop): ").strip()
+        if pending is None:
+            # Through ask(): under --yes the empty default name ends field entry
+            answer = lambda key, prompt: ask(f'model.field_{key}', prompt)
+        elif pending:
+            field = pending.pop(0)
+            answer = lambda key, prompt, field=field: answer_text(field.get(key, ''))
+        else:
+            break
+
+        field_name = answer('name', "\n> New property name (or press <Enter> to stop): ").strip()
         if not field_name:
             break
+        if re.search(rf"^    {re.escape(field_name)} = ", fields_code, flags=re.M):
+            # A fixed answer (DJANGO_CLI_MODEL_FIELD_NAME) would otherwise repeat forever
+            print(f"  Field '{field_name}' was already added; stopping.")
+            break
             
         print("  Field types: string (default), text, int, float, bool, date, datetime, email, file, image, json")
         print("  Relations: foreignkey, onetoone, manytomany")
-        field_type_input = input("  > Field type [string]: ").strip().lower()
+        field_type_input = answer('type', "  > Field type [string]: ").strip().lower()
         
         definition = ""
         is_relation = False
         
         # Field mapping
         if not field_type_input or field_type_input == 'string':
-            max_len = input("  > Max Length [255]: ").strip()
+            max_len = answer('max_length', "  > Max Length [255]: ").strip()
             if not max_len: max_len = "255"
             definition = f"models.CharField(max_length={max_len})"
         elif field_type_input == 'text':
@@ -225,31 +369,31 @@ def get_fields_interactive(existing_model=False):
             definition = "models.EmailField()"
         elif field_type_input == 'file':
             ensure_media_config()
-            upload_to = input("  > Upload to [uploads/]: ").strip()
+            upload_to = answer('upload_to', "  > Upload to [uploads/]: ").strip()
             if not upload_to: upload_to = "uploads/"
             definition = f"models.FileField(upload_to='{upload_to}')"
         elif field_type_input == 'image':
             ensure_media_config()
-            upload_to = input("  > Upload to [uploads/]: ").strip()
+            upload_to = answer('upload_to', "  > Upload to [uploads/]: ").strip()
             if not upload_to: upload_to = "uploads/"
             definition = f"models.ImageField(upload_to='{upload_to}')"
             print("  (Note: ImageField requires 'Pillow' library installed)")
         elif field_type_input == 'foreignkey':
             is_relation = True
-            related_model = input("  > Related Model (e.g., 'auth.User' or 'OtherModel'): ").strip()
+            related_model = answer('related_model', "  > Related Model (e.g., 'auth.User' or 'OtherModel'): ").strip()
             definition = f"models.ForeignKey('{related_model}', on_delete=models.CASCADE)"
         elif field_type_input == 'onetoone':
             is_relation = True
-            related_model = input("  > Related Model: ").strip()
+            related_model = answer('related_model', "  > Related Model: ").strip()
             definition = f"models.OneToOneField('{related_model}', on_delete=models.CASCADE)"
         elif field_type_input == 'manytomany':
             is_relation = True
-            related_model = input("  > Related Model: ").strip()
+            related_model = answer('related_model', "  > Related Model: ").strip()
             definition = f"models.ManyToManyField('{related_model}')"
         
         elif field_type_input == 'json':
             print("  Default value: list ([]), dict ({}), or empty (None)")
-            json_default = input("  > Default [list]: ").strip().lower()
+            json_default = answer('default', "  > Default [list]: ").strip().lower()
             if json_default == 'dict':
                 definition = "models.JSONField(default=dict)"
             elif json_default == 'empty':
@@ -261,7 +405,7 @@ def get_fields_interactive(existing_model=False):
             print(f"  Unknown type '{field_type_input}', defaulting to CharField.")
             definition = "models.CharField(max_length=255)"
             
-        nullable = input("  > Can this field be null in the database (nullable)? (yes/no) [no]: ").strip().lower()
+        nullable = answer('nullable', "  > Can this field be null in the database (nullable)? (yes/no) [no]: ").strip().lower()
         if nullable in ['yes', 'y', 'true']:
             if "()" in definition:
                 definition = definition.replace("()", "(null=True, blank=True)")
@@ -273,6 +417,7 @@ def get_fields_interactive(existing_model=False):
 
     return fields_code
 
+@traced
 def list_routes():
     from django.urls import get_resolver
     from django.urls.resolvers import URLPattern, URLResolver
@@ -326,6 +471,7 @@ def list_routes():
         print(f"{clean_pattern:<40} | {methods:<25} | {view:<20} | {name:<15}")
     print("="*100 + "\n")
 
+@traced
 def ensure_model_exists(app_name, model_name):
     models_path = os.path.join(app_name, 'models.py')
     with open(models_path, 'r') as f:
@@ -371,12 +517,18 @@ def ensure_model_exists(app_name, model_name):
     # NEW MODEL
     print(f"Creating model '{model_name}' in '{app_name}'...")
     
-    add_timestamps = input("  > Do you want to add created_at and updated_at timestamps? (yes/no) [yes]: ").strip().lower()
+    spec = ANSWERS.get('models', {}).get(f"{app_name}.{model_name}")
+    if isinstance(spec, list):
+        spec = {'fields': spec}
+    if spec is not None:
+        add_timestamps = answer_text(spec.get('timestamps', True))
+    else:
+        add_timestamps = ask('model.timestamps', "  > Do you want to add created_at and updated_at timestamps? (yes/no) [yes]: ").strip().lower()
     timestamp_fields = ""
     if add_timestamps in ['', 'yes', 'y', 'true']:
         timestamp_fields = "    created_at = models.DateTimeField(auto_now_add=True)\n    updated_at = models.DateTimeField(auto_now=True)\n"
     
-    fields_code = timestamp_fields + get_fields_interactive(existing_model=False)
+    fields_code = timestamp_fields + get_fields_interactive(existing_model=False, spec=spec['fields'] if spec else None)
 
     if not fields_code:
         fields_code = "    description = models.CharField(max_length=200, default='Description')\n    created_at = models.DateTimeField(auto_now_add=True)\n"
@@ -396,49 +548,16 @@ def get_model_class(app_name, model_name):
         print(f"Warning: Model '{model_name}' is not yet loaded in Django registry. Template generation might use generic fields.")
         return None
 
-def generate_form(app_name, model_name):
-    print(f"\nGenerating forms.py for {model_name}...")
-    forms_path = os.path.join(app_name, 'forms.py')
-    
-    import_line = f"from .models import {model_name}\n"
-    class_def = textwrap.dedent(f"""
+def form_fragment(model_name):
+    return textwrap.dedent(f"""
     class {model_name}Form(forms.ModelForm):
         class Meta:
             model = {model_name}
             fields = '__all__'
     """)
-    
-    if not os.path.exists(forms_path):
-        with open(forms_path, 'w') as f:
-            f.write("from django import forms\n")
-            f.write(import_line)
-            f.write(class_def)
-    else:
-        with open(forms_path, 'r') as f:
-            content = f.read()
-        if f"class {model_name}Form" in content:
-            print(f"Form for {model_name} already exists. Skipping.")
-        else:
-            with open(forms_path, 'a') as f:
-                if "from django import forms" not in content:
-                    f.write("\nfrom django import forms\n")
-                if import_line.strip() not in content:
-                    f.write(import_line)
-                f.write(class_def)
-    print("forms.py updated.")
 
-def generate_views(app_name, model_name):
-    print(f"\nGenerating views.py for {model_name}...")
-    views_path = os.path.join(app_name, 'views.py')
-    
-    imports = textwrap.dedent(f"""
-    from django.urls import reverse_lazy
-    from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-    from .models import {model_name}
-    from .forms import {model_name}Form
-    """)
-    
-    views_code = textwrap.dedent(f"""
+def views_fragment(app_name, model_name):
+    return textwrap.dedent(f"""
     class {model_name}ListView(ListView):
         model = {model_name}
         template_name = '{app_name}/{model_name.lower()}_list.html'
@@ -466,62 +585,122 @@ def generate_views(app_name, model_name):
         success_url = reverse_lazy('{app_name}:{model_name.lower()}_list')
     """)
 
-    if not os.path.exists(views_path):
-        with open(views_path, 'w') as f:
-            f.write("from django.shortcuts import render\n")
-            f.write(imports)
-            f.write(views_code)
-    else:
+def url_fragment(model_name):
+    return [
+        f"    path('{model_name.lower()}/', views.{model_name}ListView.as_view(), name='{model_name.lower()}_list'),",
+        f"    path('{model_name.lower()}/<int:pk>/', views.{model_name}DetailView.as_view(), name='{model_name.lower()}_detail'),",
+        f"    path('{model_name.lower()}/create/', views.{model_name}CreateView.as_view(), name='{model_name.lower()}_create'),",
+        f"    path('{model_name.lower()}/<int:pk>/update/', views.{model_name}UpdateView.as_view(), name='{model_name.lower()}_update'),",
+        f"    path('{model_name.lower()}/<int:pk>/delete/', views.{model_name}DeleteView.as_view(), name='{model_name.lower()}_delete'),",
+    ]
+
+def import_statement(module, names):
+    line = f"from {module} import {', '.join(names)}\n"
+    if len(line) <= 100:
+        return line
+    return f"from {module} import (\n" + "".join(f"    {name},\n" for name in names) + ")\n"
+
+def models_import_line(content, model_names):
+    # One "from .models import ..." statement for the models the module does not import yet
+    imported = set()
+    for match in re.finditer(r"^from \.models import (\([^)]*\)|.*)$", content, re.M):
+        imported.update(re.findall(r"\w+", match.group(1)))
+    missing = [m for m in model_names if m not in imported]
+    return import_statement('.models', missing) if missing else ""
+
+@traced
+def generate_form(app_name, model_names, fragments=None):
+    print(f"\nGenerating forms.py for {', '.join(model_names)}...")
+    forms_path = os.path.join(app_name, 'forms.py')
+    content = ""
+    if os.path.exists(forms_path):
+        with open(forms_path, 'r') as f:
+            content = f.read()
+
+    new_models = []
+    for model_name in model_names:
+        if f"class {model_name}Form" in content:
+            print(f"Form for {model_name} already exists. Skipping.")
+        else:
+            new_models.append(model_name)
+    if new_models:
+        fragments = fragments or {m: form_fragment(m) for m in new_models}
+        with open(forms_path, 'a') as f:
+            if "from django import forms" not in content:
+                f.write(("\n" if content else "") + "from django import forms\n")
+            f.write(models_import_line(content, new_models))
+            f.write("".join(fragments[m] for m in new_models))
+    print("forms.py updated.")
+
+@traced
+def generate_views(app_name, model_names, fragments=None):
+    print(f"\nGenerating views.py for {', '.join(model_names)}...")
+    views_path = os.path.join(app_name, 'views.py')
+    content = ""
+    if os.path.exists(views_path):
         with open(views_path, 'r') as f:
             content = f.read()
+
+    new_models = []
+    for model_name in model_names:
         if f"class {model_name}ListView" in content:
             print(f"Views for {model_name} already exist. Skipping.")
         else:
-            with open(views_path, 'a') as f:
-                f.write("\n" + imports)
-                f.write(views_code)
+            new_models.append(model_name)
+    if new_models:
+        fragments = fragments or {m: views_fragment(app_name, m) for m in new_models}
+        imports = textwrap.dedent("""
+        from django.urls import reverse_lazy
+        from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+        """)
+        imports += models_import_line(content, new_models)
+        imports += import_statement('.forms', [m + 'Form' for m in new_models])
+        with open(views_path, 'a') as f:
+            if not content:
+                f.write("from django.shortcuts import render\n")
+            f.write(imports)
+            f.write("".join(fragments[m] for m in new_models))
     print("views.py updated.")
 
-def generate_urls(app_name, model_name):
-    print(f"\nGenerating urls.py for {model_name}...")
+@traced
+def generate_urls(app_name, model_names, fragments=None):
+    print(f"\nGenerating urls.py for {', '.join(model_names)}...")
     urls_path = os.path.join(app_name, 'urls.py')
-    
-    url_patterns_lines = [
-        f"    path('{model_name.lower()}/', views.{model_name}ListView.as_view(), name='{model_name.lower()}_list'),",
-        f"    path('{model_name.lower()}/<int:pk>/', views.{model_name}DetailView.as_view(), name='{model_name.lower()}_detail'),",
-        f"    path('{model_name.lower()}/create/', views.{model_name}CreateView.as_view(), name='{model_name.lower()}_create'),",
-        f"    path('{model_name.lower()}/<int:pk>/update/', views.{model_name}UpdateView.as_view(), name='{model_name.lower()}_update'),",
-        f"    path('{model_name.lower()}/<int:pk>/delete/', views.{model_name}DeleteView.as_view(), name='{model_name.lower()}_delete'),",
-    ]
-    
+
+    lines = []
+    if os.path.exists(urls_path):
+        with open(urls_path, 'r') as f:
+            lines = f.readlines()
+
+    url_patterns_lines = []
+    for model_name in model_names:
+        if any(f"name='{model_name.lower()}_list'" in line for line in lines):
+            print(f"URLs for {model_name} already exist. Skipping.")
+        else:
+            url_patterns_lines += fragments[model_name] if fragments else url_fragment(model_name)
+
     if not os.path.exists(urls_path):
         patterns_str = "\n".join(url_patterns_lines)
         content = f"from django.urls import path\nfrom . import views\n\napp_name = '{app_name}'\n\nurlpatterns = [\n{patterns_str}\n]\n"
         with open(urls_path, 'w') as f:
             f.write(content)
-    else:
-        with open(urls_path, 'r') as f:
-            lines = f.readlines()
-        
-        if any(f"name='{model_name.lower()}_list'" in line for line in lines):
-             print(f"URLs for {model_name} already exist. Skipping.")
+    elif url_patterns_lines:
+        end_brace_index = -1
+        urlpatterns_found = False
+        for i, line in enumerate(lines):
+            if 'urlpatterns = [' in line:
+                urlpatterns_found = True
+            if urlpatterns_found and ']' in line:
+                end_brace_index = i
+
+        if end_brace_index != -1:
+            for p in url_patterns_lines:
+                lines.insert(end_brace_index, p + "\n")
+                end_brace_index += 1
+            with open(urls_path, 'w') as f:
+                f.writelines(lines)
         else:
-            end_brace_index = -1
-            urlpatterns_found = False
-            for i, line in enumerate(lines):
-                if 'urlpatterns = [' in line:
-                    urlpatterns_found = True
-                if urlpatterns_found and ']' in line:
-                    end_brace_index = i
-            
-            if end_brace_index != -1:
-                 for p in url_patterns_lines:
-                    lines.insert(end_brace_index, p + "\n")
-                    end_brace_index += 1
-                 with open(urls_path, 'w') as f:
-                    f.writelines(lines)
-            else:
-                print("Could not find 'urlpatterns = []' to append to.")
+            print("Could not find 'urlpatterns = []' to append to.")
 
     # Automate root URL inclusion
     project_name = get_project_name()
@@ -535,33 +714,168 @@ def generate_urls(app_name, model_name):
             print(f"Registering '{app_name}' URLs in project root urls.py...")
             if "urlpatterns = [" in root_content:
                 root_content = root_content.replace("urlpatterns = [", f"urlpatterns = [\n    path('{app_name}/', include('{app_name}.urls')),")
+                root_content = re.sub(r"^from django\.urls import path$", "from django.urls import path, include", root_content, count=1, flags=re.M)
                 with open(project_urls_path, 'w') as f:
                     f.write(root_content)
                 print("Project root urls.py updated.")
 
     print("urls.py updated.")
 
+@traced
+def generate_thumbnails(app_name):
+    # Image derivatives: <app>/thumbnails.py + the {% load thumbnails %} template library
+    templatetags_dir = os.path.join(app_name, 'templatetags')
+    os.makedirs(templatetags_dir, exist_ok=True)
+    init_file = os.path.join(templatetags_dir, '__init__.py')
+    if not os.path.exists(init_file):
+        with open(init_file, 'w') as f:
+            f.write("")
+
+    thumbnails_code = textwrap.dedent("""
+    import hashlib
+    import os
+    import threading
+
+    from django.conf import settings
+    from django.core.files.storage import default_storage
+
+    THUMBNAIL_DIR = getattr(settings, 'THUMBNAIL_DIR', 'thumbs')
+    THUMBNAIL_QUALITY = getattr(settings, 'THUMBNAIL_QUALITY', 80)
+
+
+    def output_format():
+        from PIL import features
+        return 'WEBP' if features.check('webp') else 'JPEG'
+
+
+    def parse_size(spec):
+        # "64x64" fits inside the box, "64x64 crop" fills it (square avatars)
+        parts = str(spec).split()
+        width, height = (int(v) for v in parts[0].lower().split('x'))
+        return (width, height), 'crop' in parts[1:]
+
+
+    def thumbnail_name(name, size, crop, mtime, fmt):
+        # The original's mtime is part of the key: re-uploading under the same name yields a new file
+        key = hashlib.sha1(f'{name}:{size[0]}x{size[1]}:{crop}:{mtime}'.encode()).hexdigest()[:16]
+        base = os.path.splitext(os.path.basename(name))[0]
+        ext = 'webp' if fmt == 'WEBP' else 'jpg'
+        return f'{THUMBNAIL_DIR}/{key[:2]}/{base}-{size[0]}x{size[1]}-{key}.{ext}'
+
+
+    def render_thumbnail(source_path, dest_path, size, crop, fmt):
+        from PIL import Image, ImageOps
+
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with Image.open(source_path) as img:
+            img = ImageOps.exif_transpose(img)
+            if crop:
+                img = ImageOps.fit(img, size)
+            else:
+                img.thumbnail(size)
+            if fmt == 'JPEG' and img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+            # Per process and thread: two requests rendering the same thumbnail never share a temp file
+            tmp_path = f'{dest_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            img.save(tmp_path, fmt, quality=THUMBNAIL_QUALITY)
+        os.replace(tmp_path, dest_path)
+
+
+    def get_thumbnail_url(field_file, spec):
+        \"\"\"
+        URL of a resized copy of an ImageField file, generated on first request and then
+        served from MEDIA_ROOT/THUMBNAIL_DIR. Falls back to the original on any error.
+        \"\"\"
+        if not field_file:
+            return ''
+        try:
+            source_path = field_file.path
+            mtime = int(os.path.getmtime(source_path))
+        except (NotImplementedError, ValueError, OSError):
+            # Remote storage or missing file: nothing to resize locally
+            return field_file.url
+
+        try:
+            size, crop = parse_size(spec)
+            fmt = output_format()
+            name = thumbnail_name(field_file.name, size, crop, mtime, fmt)
+            dest_path = os.path.join(settings.MEDIA_ROOT, name)
+            if not os.path.exists(dest_path):
+                render_thumbnail(source_path, dest_path, size, crop, fmt)
+        except Exception:
+            return field_file.url
+        return default_storage.url(name)
+    """)
+    with open(os.path.join(app_name, 'thumbnails.py'), 'w') as f:
+        f.write(thumbnails_code.strip() + "\n")
+
+    tags_code = textwrap.dedent("""
+    from django import template
+
+    from ..thumbnails import get_thumbnail_url
+
+    register = template.Library()
+
+
+    @register.filter
+    def thumbnail(image, spec='128x128'):
+        # {{ obj.photo|thumbnail:"64x64 crop" }}
+        return get_thumbnail_url(image, spec)
+    """)
+    with open(os.path.join(templatetags_dir, 'thumbnails.py'), 'w') as f:
+        f.write(tags_code.strip() + "\n")
+    print(f"✔ Thumbnails generated: {app_name}/thumbnails.py and {app_name}/templatetags/thumbnails.py")
+
+def ensure_thumbnails(app_name):
+    # One 'thumbnails' template library per project: Django warns when two apps register the same name
+    for item in os.listdir('.'):
+        if os.path.exists(os.path.join(item, 'templatetags', 'thumbnails.py')):
+            return item
+    generate_thumbnails(app_name)
+    return app_name
+
+def model_image_fields(model_class):
+    if not model_class:
+        return set()
+    # get_internal_type() reports 'FileField' for ImageField
+    return {f.name for f in model_class._meta.fields if isinstance(f, ImageField)}
+
+@traced
 def generate_templates(app_name, model_name, model_class):
+    # Shared files (settings TEMPLATES, base.html, the thumbnails library) are prepared by the caller
     print(f"\nGenerating templates for {model_name}...")
-    
-    # Ensure root configuration matches
-    ensure_templates_config()
 
     templates_dir = os.path.join(app_name, 'templates', app_name)
     os.makedirs(templates_dir, exist_ok=True)
     
+    load_tags = ""
     if model_class:
         fields = [f.name for f in model_class._meta.fields if f.name != 'id']
+        image_fields = model_image_fields(model_class)
+        if image_fields:
+            # Render resized derivatives instead of the uploaded originals
+            load_tags = "\n    {% load thumbnails %}"
+
+        def cell(f):
+            if f in image_fields:
+                return f"{{% if item.{f} %}}<img src=\"{{{{ item.{f}|thumbnail:'96x96 crop' }}}}\" width=\"48\" height=\"48\" loading=\"lazy\">{{% endif %}}"
+            return f"{{{{ item.{f} }}}}"
+
+        def detail(f):
+            if f in image_fields:
+                return f"{{% if object.{f} %}}<img src=\"{{{{ object.{f}|thumbnail:'800x800' }}}}\" class=\"img-fluid\">{{% endif %}}"
+            return f"{{{{ object.{f} }}}}"
+
         field_headers = "".join([f"                    <th>{f.capitalize()}</th>\n" for f in fields])
-        field_cells = "".join([f"                    <td>{{{{ item.{f} }}}}</td>\n" for f in fields])
-        detail_fields = "".join([f"            <li><strong>{f.capitalize()}:</strong> {{{{ object.{f} }}}}</li>\n" for f in fields])
+        field_cells = "".join([f"                    <td>{cell(f)}</td>\n" for f in fields])
+        detail_fields = "".join([f"            <li><strong>{f.capitalize()}:</strong> {detail(f)}</li>\n" for f in fields])
     else:
         field_headers = "                    <th>Description</th>\n"
         field_cells = "                    <td>{{ item }}</td>\n"
         detail_fields = "            <li>{{ object }}</li>\n"
 
     list_html = textwrap.dedent(f"""
-    {{% extends 'base.html' %}}
+    {{% extends 'base.html' %}}{load_tags}
 
     {{% block title %}}{model_name} List{{% endblock %}}
 
@@ -614,7 +928,7 @@ def generate_templates(app_name, model_name, model_class):
         f.write(form_html)
 
     detail_html = textwrap.dedent(f"""
-    {{% extends 'base.html' %}}
+    {{% extends 'base.html' %}}{load_tags}
 
     {{% block title %}}{model_name} Detail{{% endblock %}}
 
@@ -647,8 +961,47 @@ def generate_templates(app_name, model_name, model_class):
     """)
     with open(os.path.join(templates_dir, f'{model_name.lower()}_confirm_delete.html'), 'w') as f:
         f.write(delete_html)
-    print("Templates generated.")
-
+    print(f"Templates for {model_name} generated.")
+
+@traced
+def build_model_artifacts(app_name, model_name, model_class, with_templates):
+    # Per-model work: independent files plus the fragments merged into the shared modules
+    if with_templates:
+        generate_templates(app_name, model_name, model_class)
+    return {
+        'form': form_fragment(model_name),
+        'views': views_fragment(app_name, model_name),
+        'urls': url_fragment(model_name),
+    }
+
+@traced
+def generate_crud(app_name, model_names, command='make:crud', jobs=None):
+    # 1. Shared prerequisites, in order (interactive prompts cannot run in parallel)
+    ensure_app_exists(app_name)
+    for model_name in model_names:
+        ensure_model_exists(app_name, model_name)
+    model_classes = {m: get_model_class(app_name, m) for m in model_names}
+    with_templates = command in ['make:view', 'make:crud']
+    if with_templates:
+        ensure_templates_config()
+        if any(model_image_fields(model_class) for model_class in model_classes.values()):
+            ensure_thumbnails(app_name)
+
+    # 2. Per-model artifacts in parallel
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {m: pool.submit(build_model_artifacts, app_name, m, model_classes[m], with_templates) for m in model_names}
+        artifacts = {m: future.result() for m, future in futures.items()}
+
+    # 3. Shared modules merged by a single writer: forms before views (views import the forms)
+    if command in ['make:form', 'make:crud']:
+        generate_form(app_name, model_names, {m: a['form'] for m, a in artifacts.items()})
+    if with_templates:
+        generate_views(app_name, model_names, {m: a['views'] for m, a in artifacts.items()})
+        generate_urls(app_name, model_names, {m: a['urls'] for m, a in artifacts.items()})
+    print(f"\n✔ Generated {len(model_names)} model(s) in {time.perf_counter() - start:.2f}s")
+
+@traced
 def ensure_static_config(project_name=None):
     if not project_name:
         project_name = get_project_name()
@@ -686,6 +1039,832 @@ def ensure_static_config(project_name=None):
             f.write(content)
         print("settings.py updated with static files configuration.")
 
+def detect_db_engine(settings_content):
+    # Prefer the loaded settings, fall back to reading the ENGINE string from settings.py
+    try:
+        return settings.DATABASES['default']['ENGINE']
+    except Exception:
+        pass
+    match = re.search(r"['\"]ENGINE['\"]\s*:\s*['\"]([\w.]+)['\"]", settings_content)
+    return match.group(1) if match else ''
+
+def build_db_connection_settings(engine, max_age=600):
+    lines = ["", "# Database connection persistence (deploy:config)"]
+    use_pool = False
+    if 'postgresql' in engine and django.VERSION >= (5, 1):
+        try:
+            import psycopg_pool
+            use_pool = True
+        except ImportError:
+            pass
+
+    if use_pool:
+        # Django refuses CONN_MAX_AGE with the native pool: the pool keeps connections alive instead
+        lines.append("DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {'min_size': 2, 'max_size': 10}")
+        lines.append("DATABASES['default']['CONN_MAX_AGE'] = 0")
+    else:
+        lines.append(f"DATABASES['default']['CONN_MAX_AGE'] = {max_age}")
+        lines.append("DATABASES['default']['CONN_HEALTH_CHECKS'] = True")
+    return "\n".join(lines) + "\n", use_pool
+
+def measure_db_connection_latency(samples=30):
+    # p50 of 'SELECT 1' when a new connection is opened for every request vs. a reused one
+    from django.db import connections
+    connection = connections['default']
+
+    def run(reuse):
+        timings = []
+        for _ in range(samples):
+            if not reuse:
+                connection.close()
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    connection.close()
+    before = run(reuse=False)
+    after = run(reuse=True)
+    connection.close()
+    return before, after
+
+SQLITE_PRAGMAS = [
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('mmap_size', 134217728),
+    ('cache_size', -20000),
+    ('busy_timeout', 5000),
+]
+
+def benchmark_sqlite(pragmas, duration=2.0, writers=4, readers=4):
+    # Concurrent readers/writers against a throwaway database, mimicking several Passenger workers
+    import sqlite3
+    import tempfile
+    import threading
+    import random
+    import shutil
+
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, 'bench.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, payload TEXT)')
+    conn.executemany('INSERT INTO item (payload) VALUES (?)', [('x' * 200,)] * 2000)
+    conn.commit()
+    conn.close()
+
+    counts = {'reads': 0, 'writes': 0, 'locked': 0}
+    counts_lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(kind):
+        conn = sqlite3.connect(path, timeout=5.0)
+        for pragma, value in pragmas:
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        done = locked = 0
+        while time.perf_counter() < deadline:
+            try:
+                if kind == 'reads':
+                    conn.execute('SELECT payload FROM item WHERE id = ?', (random.randint(1, 2000),)).fetchone()
+                else:
+                    conn.execute('INSERT INTO item (payload) VALUES (?)', ('y' * 200,))
+                    conn.commit()
+                done += 1
+            except sqlite3.OperationalError:
+                conn.rollback()
+                locked += 1
+        conn.close()
+        with counts_lock:
+            counts[kind] += done
+            counts['locked'] += locked
+
+    threads = [threading.Thread(target=worker, args=('writes',)) for _ in range(writers)]
+    threads += [threading.Thread(target=worker, args=('reads',)) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return {
+        'reads_per_sec': counts['reads'] / duration,
+        'writes_per_sec': counts['writes'] / duration,
+        'locked': counts['locked'],
+    }
+
+@traced
+def tune_sqlite(project_name=None):
+    if not project_name:
+        project_name = get_project_name()
+    settings_path = os.path.join(project_name, 'settings.py')
+    if not os.path.exists(settings_path):
+        print(f"Error: {settings_path} not found.")
+        return
+
+    with open(settings_path, 'r') as f:
+        content = f.read()
+
+    engine = detect_db_engine(content)
+    if 'sqlite' not in engine:
+        print(f"Warning: the default database engine is '{engine or 'unknown'}', not SQLite.")
+        print("The handler only touches SQLite connections, so it is harmless elsewhere.")
+
+    # 1. Signal handler applied to every new SQLite connection
+    tuning_path = os.path.join(project_name, 'sqlite_tuning.py')
+    pragma_lines = "".join(f"    ('{pragma}', {value!r}),\n" for pragma, value in SQLITE_PRAGMAS)
+    tuning_code = textwrap.dedent("""
+    from django.db.backends.signals import connection_created
+    from django.dispatch import receiver
+
+    # Applied to every new connection (journal_mode=WAL is also persisted in the database file)
+    SQLITE_PRAGMAS = [
+    {pragmas}]
+
+
+    @receiver(connection_created, dispatch_uid='sqlite_tuning')
+    def tune_sqlite_connection(sender, connection, **kwargs):
+        if connection.vendor != 'sqlite':
+            return
+        with connection.cursor() as cursor:
+            for pragma, value in SQLITE_PRAGMAS:
+                cursor.execute(f'PRAGMA {{pragma}} = {{value}}')
+    """).format(pragmas=pragma_lines)
+    with open(tuning_path, 'w') as f:
+        f.write(tuning_code.strip() + "\n")
+    print(f"✔ Created {tuning_path}")
+
+    # 2. Load it from settings.py so it is connected before the first query
+    if 'sqlite_tuning' not in content:
+        content += f"\n# SQLite tuning (db:tune sqlite)\nimport {project_name}.sqlite_tuning  # noqa: E402,F401\n"
+        with open(settings_path, 'w') as f:
+            f.write(content)
+        print("✔ settings.py updated to load the SQLite tuning handler.")
+    else:
+        print("settings.py already loads the SQLite tuning handler.")
+
+    # 3. Benchmark
+    run_bench = ask('db_tune.benchmark', "Run the concurrent read/write benchmark? (yes/no) [yes]: ").strip().lower()
+    if run_bench in ['', 'yes', 'y']:
+        print("Benchmarking (4 writers, 4 readers)...")
+        default = benchmark_sqlite([])
+        tuned = benchmark_sqlite(SQLITE_PRAGMAS)
+        print(f"{'PROFILE':<10} | {'READS/S':>10} | {'WRITES/S':>10} | {'LOCKED':>8}")
+        print("-" * 46)
+        for label, result in [('default', default), ('tuned', tuned)]:
+            print(f"{label:<10} | {result['reads_per_sec']:>10.0f} | {result['writes_per_sec']:>10.0f} | {result['locked']:>8}")
+
+def set_settings_block(content, name, block):
+    # Replace (or append) a block delimited by "# BEGIN <name>" / "# END <name>" markers
+    begin, end = f"# BEGIN {name}", f"# END {name}"
+    new_block = f"{begin}\n{block.strip()}\n{end}"
+    pattern = re.compile(re.escape(begin) + r".*?" + re.escape(end), re.DOTALL)
+    if pattern.search(content):
+        return pattern.sub(lambda m: new_block, content)
+    return content.rstrip("\n") + "\n\n" + new_block + "\n"
+
+CACHE_BACKENDS = {
+    # name: (BACKEND, default LOCATION expression, client package)
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', "BASE_DIR / 'django_cache'", None),
+    'db': ('django.core.cache.backends.db.DatabaseCache', "'django_cache'", None),
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', "'default'", None),
+    'memcached': ('django.core.cache.backends.memcached.PyMemcacheCache', "'127.0.0.1:11211'", 'pymemcache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', "'redis://127.0.0.1:6379/1'", 'redis'),
+}
+
+CACHE_SELFTEST_CODE = textwrap.dedent("""
+    import time
+    from django.core.cache import cache
+    n, keys = 2000, 200  # stay below the default MAX_ENTRIES (300) of file/db caches
+    start = time.perf_counter()
+    for i in range(n):
+        cache.set(f'cache-selftest:{i % keys}', i)
+    set_time = time.perf_counter() - start
+    start = time.perf_counter()
+    hits = sum(cache.get(f'cache-selftest:{i % keys}') is not None for i in range(n))
+    get_time = time.perf_counter() - start
+    cache.delete_many([f'cache-selftest:{i}' for i in range(keys)])
+    print(f'  set: {n / set_time:,.0f} ops/s   get: {n / get_time:,.0f} ops/s   hit rate: {hits / n:.0%}')
+""")
+
+@traced
+def configure_cache(backend=None, project_name=None):
+    if not project_name:
+        project_name = get_project_name()
+    settings_path = os.path.join(project_name, 'settings.py')
+    if not os.path.exists(settings_path):
+        print(f"Error: {settings_path} not found.")
+        return
+
+    print("\n" + "="*40)
+    print("Cache Configuration")
+    print("="*40)
+
+    if backend not in CACHE_BACKENDS:
+        print(f"Backends: {', '.join(CACHE_BACKENDS)}")
+        backend = ask('cache.backend', "Cache backend [file]: ").strip().lower() or 'file'
+        if backend not in CACHE_BACKENDS:
+            print(f"Error: unknown backend '{backend}'.")
+            return
+
+    backend_path, default_location, client_package = CACHE_BACKENDS[backend]
+
+    if client_package:
+        try:
+            __import__(client_package)
+        except ImportError:
+            install = ask('cache.install_client', f"  > '{client_package}' not found. Install it? (yes/no) [yes]: ").strip().lower()
+            if install in ['', 'yes', 'y']:
+                try:
+                    run_subprocess([sys.executable, '-m', 'pip', 'install', client_package])
+                except subprocess.CalledProcessError:
+                    print(f"  > Failed to install {client_package}.")
+
+    location = ask('cache.location', f"Location [{default_location}]: ").strip()
+    location = repr(location) if location else default_location
+    key_prefix = ask('cache.key_prefix', f"Key prefix [{project_name}]: ").strip() or project_name
+    version = ask('cache.version', "Version [1]: ").strip()
+    version = int(version) if version.isdigit() else 1
+    timeout = ask('cache.timeout', "Default timeout in seconds (0 = never expire) [300]: ").strip()
+    timeout = timeout if timeout.isdigit() else "300"
+    timeout = "None" if timeout == "0" else timeout
+
+    with open(settings_path, 'r') as f:
+        content = f.read()
+
+    if 'CACHES' in content and '# BEGIN cache:config' not in content:
+        print("Warning: CACHES is already defined in settings.py by hand. Skipping to avoid overwriting it.")
+        return
+
+    cache_block = textwrap.dedent(f"""
+    CACHES = {{
+        'default': {{
+            'BACKEND': '{backend_path}',
+            'LOCATION': {location},
+            'KEY_PREFIX': '{key_prefix}',
+            'VERSION': {version},
+            'TIMEOUT': {timeout},
+        }}
+    }}
+    """)
+    content = set_settings_block(content, 'cache:config', cache_block)
+    with open(settings_path, 'w') as f:
+        f.write(content)
+    print(f"✔ settings.py updated with the '{backend}' cache backend.")
+
+    if backend == 'locmem':
+        print("Note: locmem is per-process; Passenger/Gunicorn workers will not share it.")
+
+    if backend == 'db':
+        try:
+            print("Running createcachetable...")
+            run_subprocess([sys.executable, 'manage.py', 'createcachetable'])
+            print("✔ Cache table created.")
+        except subprocess.CalledProcessError:
+            print("✘ createcachetable failed. Please run it manually.")
+
+    run_selftest = ask('cache.selftest', "Run the get/set throughput self-test? (yes/no) [yes]: ").strip().lower()
+    if run_selftest in ['', 'yes', 'y']:
+        try:
+            print("Running cache self-test...")
+            run_subprocess([sys.executable, 'manage.py', 'shell', '-c', CACHE_SELFTEST_CODE])
+        except subprocess.CalledProcessError:
+            print("✘ Cache self-test failed. Check that the cache server is reachable.")
+
+STATIC_SKIP_COMPRESS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.ico', '.zip', '.gz', '.br', '.tgz',
+    '.bz2', '.woff', '.woff2', '.mp3', '.mp4', '.webm', '.ogg', '.pdf',
+)
+
+def compress_static_file(job):
+    # Runs in a worker process: hash one collected file and (re)write its .gz/.br siblings
+    path, cached, use_brotli = job
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    outputs = [('gzip', path + '.gz')]
+    if use_brotli:
+        outputs.append(('brotli', path + '.br'))
+
+    if cached and cached['hash'] == digest and all(
+        cached.get(kind) is None or os.path.exists(out_path) for kind, out_path in outputs
+    ):
+        return dict(cached, path=path, skipped=True)
+
+    result = {'path': path, 'hash': digest, 'size': len(data), 'gzip': None, 'brotli': None, 'skipped': False}
+    for kind, out_path in outputs:
+        if kind == 'gzip':
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        else:
+            import brotli
+            compressed = brotli.compress(data, quality=11)
+        # Same rule as whitenoise: keep the variant only if it saves at least 5%
+        if len(compressed) < len(data) * 0.95:
+            with open(out_path, 'wb') as f:
+                f.write(compressed)
+            result[kind] = len(compressed)
+        elif os.path.exists(out_path):
+            os.remove(out_path)
+    return result
+
+STATIC_BUILD_FILES = ('.static_build_cache.json', 'static_build_report.json')
+
+def ensure_gitignored(entries):
+    # Append the build outputs to the project's .gitignore (created if missing), once
+    lines = []
+    if os.path.exists('.gitignore'):
+        with open('.gitignore', 'r') as f:
+            lines = f.read().splitlines()
+    missing = [entry for entry in entries if entry not in lines and f'/{entry}' not in lines]
+    if not missing:
+        return
+    with open('.gitignore', 'a') as f:
+        if lines and lines[-1].strip():
+            f.write("\n")
+        f.write("# static:build outputs\n" + "".join(f"/{entry}\n" for entry in missing))
+    print(f"✔ Added {', '.join(missing)} to .gitignore")
+
+@traced
+def build_static(jobs=None, collect=True, force=False):
+    from django.core.management import call_command
+    from django.contrib.staticfiles.management.commands.collectstatic import Command as CollectStaticCommand
+    from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+
+    static_root = getattr(settings, 'STATIC_ROOT', None)
+    if not static_root:
+        print("Error: STATIC_ROOT is not configured. Run 'python django-cli.py deploy:config' first.")
+        return
+    static_root = str(static_root)
+
+    print("\n" + "="*40)
+    print("Static Build")
+    print("="*40)
+    started = time.perf_counter()
+
+    # 1. Collect + fingerprint, sequentially (collectstatic). Compression is left to the process pool below, so the
+    # collection uses plain ManifestStaticFilesStorage even when whitenoise's compressing storage is configured.
+    if collect:
+        if not isinstance(staticfiles_storage, ManifestStaticFilesStorage):
+            print("Warning: the configured STATICFILES storage is not manifest-based; templates will not use hashed names.")
+        print("Collecting and hashing static files...")
+        command = CollectStaticCommand()
+        command.storage = ManifestStaticFilesStorage()
+        call_command(command, interactive=False, verbosity=0)
+        print(f"✔ Collected into {static_root} ({time.perf_counter() - started:.1f}s)")
+
+    # 2. Precompress in parallel, skipping files whose content hash did not change
+    try:
+        import brotli
+        use_brotli = True
+    except ImportError:
+        use_brotli = False
+        print("Note: 'brotli' is not installed, only .gz files will be written (pip install brotli).")
+
+    cache_path, report_path = STATIC_BUILD_FILES
+    ensure_gitignored(STATIC_BUILD_FILES)
+    cache = {}
+    if os.path.exists(cache_path) and not force:
+        with open(cache_path, 'r') as f:
+            saved = json.load(f)
+        # A cache built with a different set of encoders cannot vouch for the siblings on disk
+        if saved.get('brotli') == use_brotli:
+            cache = saved.get('files', {})
+
+    work = []
+    for root, dirs, files in os.walk(static_root):
+        for name in files:
+            if name.endswith(STATIC_SKIP_COMPRESS) or name == 'staticfiles.json':
+                continue
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, static_root)
+            work.append((path, cache.get(rel_path), use_brotli))
+
+    compress_started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(compress_static_file, work, chunksize=16))
+    compress_time = time.perf_counter() - compress_started
+
+    new_cache = {}
+    for result in results:
+        rel_path = os.path.relpath(result['path'], static_root)
+        new_cache[rel_path] = {k: result[k] for k in ('hash', 'size', 'gzip', 'brotli')}
+    with open(cache_path, 'w') as f:
+        json.dump({'brotli': use_brotli, 'files': new_cache}, f)
+
+    # 3. Report
+    total = sum(r['size'] for r in results)
+    total_gz = sum(r['gzip'] or r['size'] for r in results)
+    total_br = sum(r['brotli'] or r['size'] for r in results)
+    skipped = sum(1 for r in results if r['skipped'])
+    report = {
+        'static_root': static_root,
+        'files': len(results),
+        'skipped_unchanged': skipped,
+        'bytes': total,
+        'gzip_bytes': total_gz,
+        'brotli_bytes': total_br if use_brotli else None,
+        'compress_seconds': round(compress_time, 3),
+        'details': sorted(
+            [
+                {
+                    'file': os.path.relpath(r['path'], static_root),
+                    'size': r['size'],
+                    'gzip': r['gzip'],
+                    'brotli': r['brotli'],
+                    'ratio': round((r['brotli'] or r['gzip'] or r['size']) / r['size'], 3) if r['size'] else 1,
+                }
+                for r in results
+            ],
+            key=lambda d: d['size'],
+            reverse=True,
+        ),
+    }
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"✔ Compressed {len(results) - skipped} files, {skipped} unchanged skipped ({compress_time:.1f}s)")
+    if total:
+        print(f"  original: {total / 1024:,.0f} KiB   gzip: {total_gz / 1024:,.0f} KiB ({total_gz / total:.0%})", end='')
+        print(f"   brotli: {total_br / 1024:,.0f} KiB ({total_br / total:.0%})" if use_brotli else "")
+    print(f"{'FILE':<50} | {'SIZE':>10} | {'RATIO':>6}")
+    print("-" * 72)
+    for detail in report['details'][:10]:
+        print(f"{detail['file'][-50:]:<50} | {detail['size']:>10,} | {detail['ratio']:>6.0%}")
+    print(f"✔ Report written to {report_path}")
+
+# ManifestStaticFilesStorage names files "<name>.<12 hex chars>.<ext>"; static:build adds .gz/.br siblings
+HASHED_STATIC_PATTERN = r"\.[0-9a-f]{12}(\.\w+)?(\.(gz|br))?$"
+COMPRESSIBLE_MIME_TYPES = [
+    'text/html', 'text/plain', 'text/css', 'text/xml', 'text/javascript', 'application/javascript',
+    'application/json', 'application/xml', 'application/manifest+json', 'image/svg+xml',
+    'font/ttf', 'font/otf', 'application/vnd.ms-fontobject',
+]
+
+def build_htaccess_performance_rules():
+    types = " ".join(COMPRESSIBLE_MIME_TYPES)
+    return textwrap.dedent(f"""
+    # BEGIN static/media performance (deploy:config)
+    # Drop the inode from ETags so they stay stable across servers
+    FileETag MTime Size
+    <IfModule mod_expires.c>
+        ExpiresActive On
+        ExpiresByType text/css "access plus 1 hour"
+        ExpiresByType text/javascript "access plus 1 hour"
+        ExpiresByType application/javascript "access plus 1 hour"
+        ExpiresByType image/jpeg "access plus 1 day"
+        ExpiresByType image/png "access plus 1 day"
+        ExpiresByType image/gif "access plus 1 day"
+        ExpiresByType image/webp "access plus 1 day"
+        ExpiresByType image/svg+xml "access plus 1 day"
+        ExpiresByType font/woff2 "access plus 1 week"
+    </IfModule>
+    # Fingerprinted files never change: cache for a year, no revalidation
+    <FilesMatch "{HASHED_STATIC_PATTERN}">
+        FileETag None
+        <IfModule mod_expires.c>
+            ExpiresActive Off
+        </IfModule>
+        <IfModule mod_headers.c>
+            Header set Cache-Control "public, max-age=31536000, immutable"
+            Header unset Expires
+        </IfModule>
+    </FilesMatch>
+    <IfModule mod_brotli.c>
+        AddOutputFilterByType BROTLI_COMPRESS {types}
+    </IfModule>
+    <IfModule mod_deflate.c>
+        AddOutputFilterByType DEFLATE {types}
+    </IfModule>
+    # Serve the .br/.gz siblings written by static:build instead of compressing on every request.
+    # Per-directory rules are not inherited, so this does not undo "RewriteEngine Off" for Passenger.
+    <IfModule mod_rewrite.c>
+        RewriteEngine On
+        RewriteCond %{{HTTP:Accept-Encoding}} br
+        RewriteCond %{{REQUEST_FILENAME}} !\\.(gz|br)$
+        RewriteCond %{{REQUEST_FILENAME}}.br -f
+        RewriteRule ^(.+)$ $1.br [L]
+        RewriteCond %{{HTTP:Accept-Encoding}} gzip
+        RewriteCond %{{REQUEST_FILENAME}} !\\.(gz|br)$
+        RewriteCond %{{REQUEST_FILENAME}}.gz -f
+        RewriteRule ^(.+)$ $1.gz [L]
+        # Second pass on the sibling itself: never compress it again
+        RewriteRule \\.(gz|br)$ - [E=no-gzip:1,E=no-brotli:1]
+    </IfModule>
+    <IfModule mod_mime.c>
+        # app.<hash>.css.br keeps text/css and gets "Content-Encoding: br"
+        RemoveType .gz .br
+        AddEncoding gzip .gz
+        AddEncoding br .br
+    </IfModule>
+    <IfModule mod_headers.c>
+        <FilesMatch "\\.(gz|br)$">
+            Header append Vary Accept-Encoding
+        </FilesMatch>
+    </IfModule>
+    # END static/media performance (deploy:config)
+    """)
+
+@traced
+def validate_htaccess(htaccess_path='.htaccess', static_root=None, sample_size=200):
+    import random
+
+    if not os.path.exists(htaccess_path):
+        print(f"Error: {htaccess_path} not found.")
+        return False
+    with open(htaccess_path, 'r') as f:
+        content = f.read()
+
+    if static_root is None:
+        static_root = str(getattr(settings, 'STATIC_ROOT', None) or 'staticfiles')
+
+    problems = []
+
+    # 1. Sections must be balanced, otherwise Apache answers 500 for the whole site
+    for tag in ['IfModule', 'FilesMatch']:
+        if content.count(f"<{tag} ") != content.count(f"</{tag}>"):
+            problems.append(f"unbalanced <{tag}> sections")
+
+    compiled = []
+    for pattern, body in re.findall(r'<FilesMatch "([^"]+)">(.*?)</FilesMatch>', content, flags=re.S):
+        try:
+            regex = re.compile(pattern)
+        except re.error as e:
+            problems.append(f"invalid FilesMatch pattern {pattern!r}: {e}")
+            continue
+        # Only the long-lived cache rules; other sections (e.g. Vary on .gz/.br) say nothing about caching
+        if 'immutable' in body:
+            compiled.append(regex)
+    compressed_types = set()
+    for line in re.findall(r'AddOutputFilterByType\s+\S+\s+(.+)', content):
+        compressed_types.update(line.split())
+
+    if not os.path.isdir(static_root):
+        print(f"Note: {static_root} not found; only the syntax was checked. Run collectstatic or static:build first.")
+        files = []
+    else:
+        files = []
+        precompressed = False
+        for root, dirs, names in os.walk(static_root):
+            files.extend(os.path.join(root, n) for n in names if not n.endswith(('.gz', '.br')))
+            precompressed = precompressed or any(n.endswith(('.gz', '.br')) for n in names)
+        files = random.sample(files, min(sample_size, len(files)))
+        # static:build siblings are only worth their disk space if Apache serves them
+        if precompressed and not (re.search(r'RewriteRule .*\$1\.(gz|br)', content) and 'AddEncoding' in content):
+            problems.append(f"{static_root} has .gz/.br files but no RewriteRule/AddEncoding serves them")
+
+    # 2. Compare against the manifest: only fingerprinted files may be cached as immutable
+    original_names = set()
+    manifest_path = os.path.join(static_root, 'staticfiles.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            original_names = {os.path.normpath(p) for p in json.load(f).get('paths', {})}
+
+    immutable = 0
+    for path in files:
+        rel_path = os.path.normpath(os.path.relpath(path, static_root))
+        name = os.path.basename(path)
+        matches = any(regex.search(name) for regex in compiled)
+        if original_names:
+            # Older fingerprinted copies are not in the manifest anymore but are still immutable
+            is_hashed = re.sub(r'\.[0-9a-f]{12}(?=\.\w+$|$)', '', rel_path) in original_names and rel_path not in original_names
+            if matches and not is_hashed:
+                problems.append(f"{rel_path} is not fingerprinted but would be cached as immutable")
+            elif is_hashed and not matches:
+                problems.append(f"{rel_path} is fingerprinted but misses the long-lived cache rule")
+            for suffix in ('.gz', '.br'):
+                # Precompressed siblings are served in place of the file and are just as immutable
+                if is_hashed and os.path.exists(path + suffix) and not any(regex.search(name + suffix) for regex in compiled):
+                    problems.append(f"{rel_path}{suffix} is fingerprinted but misses the long-lived cache rule")
+        immutable += matches
+
+        mime_type, _ = mimetypes.guess_type(name)
+        textual = mime_type in ('text/html', 'text/css', 'text/javascript', 'application/javascript',
+                                'application/json', 'application/xml', 'text/xml', 'image/svg+xml')
+        if textual and compressed_types and mime_type not in compressed_types:
+            problems.append(f"{rel_path} ({mime_type}) is not covered by the compression rules")
+
+    print(f"Checked {len(files)} file(s) from {static_root}: {immutable} cached as immutable.")
+    if not original_names and files:
+        print("Note: no staticfiles.json manifest found; fingerprint checks were skipped.")
+    if problems:
+        for problem in problems[:20]:
+            print(f"✘ {problem}")
+        if len(problems) > 20:
+            print(f"... and {len(problems) - 20} more.")
+        return False
+    print("✔ .htaccess performance rules look consistent.")
+    return True
+
+SENDFILE_BACKENDS = {'apache': 'xsendfile', 'nginx': 'xaccel', 'django': 'django'}
+
+@traced
+def configure_sendfile(server=None, project_name=None):
+    if not project_name:
+        project_name = get_project_name()
+    settings_path = os.path.join(project_name, 'settings.py')
+    urls_path = os.path.join(project_name, 'urls.py')
+    if not os.path.exists(settings_path) or not os.path.exists(urls_path):
+        print(f"Error: {settings_path} or {urls_path} not found.")
+        return
+
+    print("\n" + "="*40)
+    print("Protected Media Downloads")
+    print("="*40)
+
+    if server not in SENDFILE_BACKENDS:
+        print("Front web server: apache (mod_xsendfile), nginx (X-Accel-Redirect), django (FileResponse fallback)")
+        server = ask('sendfile.server', "Web server [apache]: ").strip().lower() or 'apache'
+        if server not in SENDFILE_BACKENDS:
+            print(f"Error: unknown web server '{server}'.")
+            return
+    require_login = ask('sendfile.require_login', "Require login to download media files? (yes/no) [yes]: ").strip().lower() in ['', 'yes', 'y']
+
+    ensure_media_config(project_name)
+
+    # 1. Download view
+    downloads_path = os.path.join(project_name, 'downloads.py')
+    downloads_code = textwrap.dedent("""
+    import mimetypes
+    import os
+    from urllib.parse import quote
+
+    from django.conf import settings
+    from django.contrib.auth.views import redirect_to_login
+    from django.core.exceptions import SuspiciousFileOperation
+    from django.http import FileResponse, Http404, HttpResponse
+    from django.utils._os import safe_join
+
+
+    def protected_media(request, path):
+        \"\"\"
+        Serve a file from MEDIA_ROOT. With SENDFILE_BACKEND = 'xsendfile' or 'xaccel' Django only
+        checks access and the front web server streams the bytes; 'django' streams with FileResponse.
+        \"\"\"
+        if getattr(settings, 'SENDFILE_REQUIRE_LOGIN', True) and not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+
+        try:
+            full_path = safe_join(settings.MEDIA_ROOT, path)
+        except SuspiciousFileOperation:
+            raise Http404
+        if not os.path.isfile(full_path):
+            raise Http404
+
+        backend = getattr(settings, 'SENDFILE_BACKEND', 'django')
+        if backend == 'django':
+            return FileResponse(open(full_path, 'rb'))
+
+        content_type, encoding = mimetypes.guess_type(full_path)
+        response = HttpResponse(content_type=content_type or 'application/octet-stream')
+        if backend == 'xsendfile':
+            response['X-Sendfile'] = full_path
+        elif backend == 'xaccel':
+            response['X-Accel-Redirect'] = quote(settings.SENDFILE_URL.rstrip('/') + '/' + path)
+        return response
+    """)
+    with open(downloads_path, 'w') as f:
+        f.write(downloads_code.strip() + "\n")
+    print(f"✔ Created {downloads_path}")
+
+    # 2. Settings
+    with open(settings_path, 'r') as f:
+        content = f.read()
+    sendfile_block = textwrap.dedent(f"""
+    # 'xsendfile' (Apache mod_xsendfile), 'xaccel' (nginx X-Accel-Redirect) or 'django' (FileResponse)
+    SENDFILE_BACKEND = '{SENDFILE_BACKENDS[server]}'
+    # nginx 'internal' location aliased to MEDIA_ROOT (xaccel only)
+    SENDFILE_URL = '/protected-media/'
+    SENDFILE_REQUIRE_LOGIN = {require_login}
+    """)
+    content = set_settings_block(content, 'media:sendfile', sendfile_block)
+    with open(settings_path, 'w') as f:
+        f.write(content)
+    print("✔ settings.py updated with SENDFILE_* settings.")
+
+    # 3. URL: the DEBUG static() pattern stays first, so this one only answers in production
+    with open(urls_path, 'r') as f:
+        urls_content = f.read()
+    if 'protected_media' not in urls_content:
+        imports = []
+        if 'from django.conf import settings' not in urls_content:
+            imports.append('from django.conf import settings')
+        imports.append('from django.urls import re_path')
+        imports.append('from .downloads import protected_media')
+        urls_content = "\n".join(imports) + "\n" + urls_content
+        urls_content += textwrap.dedent("""
+
+        # Media downloads handed to the front web server (media:sendfile)
+        urlpatterns += [
+            re_path(r'^' + settings.MEDIA_URL.lstrip('/') + r'(?P<path>.+)$', protected_media, name='protected_media'),
+        ]
+        """)
+        with open(urls_path, 'w') as f:
+            f.write(urls_content)
+        print("✔ urls.py updated with the protected media route.")
+
+    # 4. Web server snippets
+    media_root = str(getattr(settings, 'MEDIA_ROOT', '') or os.path.join(os.getcwd(), 'uploads'))
+    print("\n" + "="*40)
+    if server == 'apache':
+        print("Apache: install mod_xsendfile, then add to the virtual host (XSendFilePath is not allowed in .htaccess):")
+        print(f"    XSendFile On\n    XSendFilePath {media_root}")
+    elif server == 'nginx':
+        print("nginx: add an internal location to the server block:")
+        print(f"    location /protected-media/ {{\n        internal;\n        alias {media_root.rstrip('/')}/;\n    }}")
+        print("Remove any public 'location /uploads/' block so downloads go through Django.")
+    else:
+        print("Files are streamed by Django with FileResponse; switch SENDFILE_BACKEND when the web server supports it.")
+
+SITEMAP_MAX_URLS = 50000  # sitemaps.org protocol limit per file
+SITEMAP_CACHE_SECONDS = 60 * 60 * 6
+
+def find_crud_models():
+    """Return (namespace, model) pairs for every model exposing a make:crud detail route."""
+    found = []
+    for app_config in apps.get_app_configs():
+        urls_path = os.path.join(app_config.path, 'urls.py')
+        if not os.path.abspath(urls_path).startswith(os.getcwd()) or not os.path.exists(urls_path):
+            continue
+        with open(urls_path, 'r') as f:
+            content = f.read()
+        namespace = re.search(r"^app_name\s*=\s*['\"](\w+)['\"]", content, re.M)
+        namespace = namespace.group(1) if namespace else app_config.label
+        for model_name in re.findall(r"views\.(\w+)DetailView\.as_view\(\)", content):
+            try:
+                model = app_config.get_model(model_name)
+            except LookupError:
+                continue
+            found.append((namespace, model))
+    return found
+
+def build_sitemaps_module(crud_models):
+    imports = {}
+    for _, model in crud_models:
+        imports.setdefault(model.__module__, set()).add(model.__name__)
+    import_lines = [f"from {module} import {', '.join(sorted(names))}" for module, names in sorted(imports.items())]
+    classes = []
+    sections = ["    'static': StaticViewSitemap,"]
+    for namespace, model in crud_models:
+        field_names = {f.name for f in model._meta.concrete_fields}
+        lastmod_field = next((name for name in ('updated_at', 'modified_at', 'updated') if name in field_names), None)
+        only = "'pk', " + f"'{lastmod_field}'" if lastmod_field else "'pk'"
+        code = textwrap.dedent(f"""
+        class {model.__name__}Sitemap(sitemaps.Sitemap):
+            changefreq = 'weekly'
+            priority = 0.6
+            limit = {SITEMAP_MAX_URLS}
+
+            def items(self):
+                # Each sitemap page is a LIMIT/OFFSET slice of this queryset
+                return {model.__name__}.objects.only({only}).order_by('pk')
+
+            def location(self, obj):
+                return reverse('{namespace}:{model.__name__.lower()}_detail', args=[obj.pk])
+        """)
+        if lastmod_field:
+            code += textwrap.indent(textwrap.dedent(f"""
+            def lastmod(self, obj):
+                return obj.{lastmod_field}
+
+            def get_latest_lastmod(self):
+                # The default implementation iterates every row to find the maximum
+                return {model.__name__}.objects.aggregate(latest=Max('{lastmod_field}'))['latest']
+            """), '    ')
+        classes.append(code)
+        sections.append(f"    '{namespace}-{model.__name__.lower()}': {model.__name__}Sitemap,")
+
+    header = textwrap.dedent("""
+    # Generated by django-cli deploy:config; rerun it after make:crud to refresh the model sitemaps.
+    from django.contrib import sitemaps
+    from django.db.models import Max
+    from django.urls import NoReverseMatch, reverse
+    """).lstrip()
+    static = textwrap.dedent("""
+    class StaticViewSitemap(sitemaps.Sitemap):
+        priority = 0.5
+        changefreq = 'daily'
+
+        def items(self):
+            # Add your static view names here
+            names = ['accounts:landing', 'accounts:login', 'accounts:register']
+            return [name for name in names if self._resolves(name)]
+
+        def location(self, item):
+            return reverse(item)
+
+        @staticmethod
+        def _resolves(name):
+            try:
+                reverse(name)
+            except NoReverseMatch:
+                return False
+            return True
+    """)
+    blocks = [header + "\n".join(import_lines), static] + classes + ["SITEMAPS = {\n" + "\n".join(sections) + "\n}"]
+    return "\n\n\n".join(block.strip() for block in blocks) + "\n"
+
+@traced
 def configure_deployment():
     print("\n" + "="*40)
     print("Deployment Configuration (Passenger/cPanel)")
@@ -695,15 +1874,15 @@ def configure_deployment():
     print(f"Detected project name: {project_name}")
     
     # Interactive Prompts
-    domain = input(f"Domain name (e.g. example.com): ").strip()
+    domain = ask('deploy.domain', f"Domain name (e.g. example.com): ").strip()
     
     default_app_root = os.getcwd()
-    app_root = input(f"Application Root Path [{default_app_root}]: ").strip()
+    app_root = ask('deploy.app_root', f"Application Root Path [{default_app_root}]: ").strip()
     if not app_root:
         app_root = default_app_root
         
     default_python = sys.executable
-    python_path = input(f"Python Interpreter Path [{default_python}]: ").strip()
+    python_path = ask('deploy.python_path', f"Python Interpreter Path [{default_python}]: ").strip()
     if not python_path:
         python_path = default_python
     
@@ -736,9 +1915,14 @@ def configure_deployment():
     # IMPORTANT
     RewriteEngine Off
     """)
+
+    add_perf_rules = ask('deploy.htaccess_rules', "Add static/media caching and compression rules to .htaccess? (yes/no) [yes]: ").strip().lower()
+    add_perf_rules = add_perf_rules in ['', 'yes', 'y']
+    if add_perf_rules:
+        htaccess_content = htaccess_content.rstrip() + "\n" + build_htaccess_performance_rules()
     
     if os.path.exists(htaccess_path):
-        overwrite = input(f"Warning: {htaccess_path} already exists. Overwrite? (yes/no) [no]: ").strip().lower()
+        overwrite = ask('deploy.htaccess_overwrite', f"Warning: {htaccess_path} already exists. Overwrite? (yes/no) [no]: ").strip().lower()
         if overwrite not in ['yes', 'y']:
             print("Skipping .htaccess generation.")
         else:
@@ -750,6 +1934,10 @@ def configure_deployment():
             f.write(htaccess_content.strip())
         print(f"Created {htaccess_path}")
 
+    if add_perf_rules and os.path.exists(htaccess_path):
+        print("Validating .htaccess performance rules...")
+        validate_htaccess(htaccess_path)
+
     print("\n" + "="*40)
     print("Deployment configuration completed.")
     print(f"1. .htaccess file created/updated.")
@@ -791,7 +1979,7 @@ def configure_deployment():
         
         # DEBUG
         # We ask before turning off DEBUG
-        turn_off_debug = input("Do you want to set DEBUG = False? (yes/no) [yes]: ").strip().lower()
+        turn_off_debug = ask('deploy.debug_off', "Do you want to set DEBUG = False? (yes/no) [yes]: ").strip().lower()
         if turn_off_debug in ['', 'yes', 'y']:
              if "DEBUG = True" in settings_content:
                  settings_content = settings_content.replace("DEBUG = True", "DEBUG = False")
@@ -808,10 +1996,10 @@ def configure_deployment():
             pass
 
         if not whitenoise_installed:
-             install_wn = input("  > Whitenoise not found. Install it for static files support? (yes/no) [yes]: ").strip().lower()
+             install_wn = ask('deploy.install_whitenoise', "  > Whitenoise not found. Install it for static files support? (yes/no) [yes]: ").strip().lower()
              if install_wn in ['', 'yes', 'y']:
                  try:
-                     subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'whitenoise'])
+                     run_subprocess([sys.executable, '-m', 'pip', 'install', 'whitenoise'])
                      whitenoise_installed = True
                      print("  > Whitenoise installed.")
                  except subprocess.CalledProcessError:
@@ -834,9 +2022,35 @@ def configure_deployment():
                  modified_settings = True
                  print("  - Added STATICFILES_STORAGE for Whitenoise")
 
+        # Database connections
+        print("  - Checking database connection settings...")
+        if 'CONN_MAX_AGE' not in settings_content:
+            engine = detect_db_engine(settings_content)
+            print(f"  > Detected database engine: {engine or 'unknown'}")
+            persist = ask('deploy.persistent_connections', "  > Enable persistent database connections and health checks? (yes/no) [yes]: ").strip().lower()
+            if persist in ['', 'yes', 'y']:
+                max_age = ask('deploy.conn_max_age', "  > CONN_MAX_AGE in seconds [600]: ").strip()
+                if not max_age.isdigit():
+                    max_age = "600"
+                db_block, use_pool = build_db_connection_settings(engine, int(max_age))
+                settings_content += db_block
+                modified_settings = True
+                if use_pool:
+                    print("  - Enabled psycopg connection pool")
+                else:
+                    print(f"  - Set CONN_MAX_AGE = {max_age} and CONN_HEALTH_CHECKS = True")
+
+                check_latency = ask('deploy.latency_check', "  > Run a connection-latency check against the database? (yes/no) [no]: ").strip().lower()
+                if check_latency in ['yes', 'y']:
+                    try:
+                        before, after = measure_db_connection_latency()
+                        print(f"  - Query latency p50: new connection {before:.2f} ms -> persistent {after:.2f} ms")
+                    except Exception as e:
+                        print(f"  > Connection-latency check failed: {e}")
+
         # Sitemap Configuration
         print("  - Checking Sitemap configuration...")
-        enable_sitemap = input("  > Do you want to enable Sitemap (sitemap.xml)? (yes/no) [yes]: ").strip().lower()
+        enable_sitemap = ask('deploy.sitemap', "  > Do you want to enable Sitemap (sitemap.xml)? (yes/no) [yes]: ").strip().lower()
         if enable_sitemap in ['', 'yes', 'y']:
             # 1. Update settings.py
             if 'django.contrib.sites' not in settings_content:
@@ -849,56 +2063,59 @@ def configure_deployment():
                 modified_settings = True
                 print("  - Added sites/sitemaps apps and SITE_ID to settings.py")
             
-            # 2. Create sitemaps.py
+            # 2. Create sitemaps.py: one section per make:crud model, paginated at the protocol limit
             sitemaps_path = os.path.join(project_name, 'sitemaps.py')
-            if not os.path.exists(sitemaps_path):
-                sitemap_code = textwrap.dedent("""
-                from django.contrib import sitemaps
-                from django.urls import reverse
-
-                class StaticViewSitemap(sitemaps.Sitemap):
-                    priority = 0.5
-                    changefreq = 'daily'
-
-                    def items(self):
-                        # Add your static view names here
-                        return ['accounts:landing', 'accounts:login', 'accounts:register']
-
-                    def location(self, item):
-                        return reverse(item)
-                """)
+            regenerate = True
+            if os.path.exists(sitemaps_path):
+                with open(sitemaps_path, 'r') as f:
+                    existing = f.read()
+                # Files from earlier versions only held StaticViewSitemap and are safe to replace
+                generated = existing.startswith('# Generated by django-cli') or (
+                    'SITEMAPS = {' not in existing and existing.count('(sitemaps.Sitemap)') == 1)
+                if not generated:
+                    regenerate = False
+                    print(f"  - {sitemaps_path} was edited by hand; leaving it untouched.")
+            if regenerate:
+                crud_models = find_crud_models()
                 with open(sitemaps_path, 'w') as f:
-                    f.write(sitemap_code.strip())
-                print(f"  - Created {sitemaps_path}")
-            
-            # 3. Update urls.py
+                    f.write(build_sitemaps_module(crud_models))
+                print(f"  - Wrote {sitemaps_path} ({len(crud_models)} model sitemap(s))")
+                for namespace, model in crud_models:
+                    if not any(f.name in ('updated_at', 'modified_at', 'updated') for f in model._meta.concrete_fields):
+                        print(f"    > {namespace}.{model.__name__} has no updated_at field; its entries carry no <lastmod>.")
+
+            # 3. Update urls.py: sitemap index + cached per-section sitemaps
             urls_path = os.path.join(project_name, 'urls.py')
             if os.path.exists(urls_path):
                 with open(urls_path, 'r') as f:
                     urls_content = f.read()
-                
-                if 'sitemap.xml' not in urls_content:
-                    # Add imports
-                    if 'from django.contrib.sitemaps.views import sitemap' not in urls_content:
-                        urls_content = urls_content.replace(
-                            "from django.urls import path, include",
-                            "from django.urls import path, include\nfrom django.contrib.sitemaps.views import sitemap\nfrom .sitemaps import StaticViewSitemap"
-                        )
-                    # Add sitemaps dict
-                    if "sitemaps = {" not in urls_content:
-                        urls_content = urls_content.replace(
-                            "urlpatterns = [",
-                            "sitemaps = {\n    'static': StaticViewSitemap,\n}\n\nurlpatterns = ["
-                        )
-                    # Add path
-                    if "path('sitemap.xml'" not in urls_content:
-                        urls_content = urls_content.replace(
-                            "urlpatterns = [",
-                            "urlpatterns = [\n    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),"
-                        )
+
+                if 'sitemap-<section>.xml' not in urls_content:
+                    # Drop the single-file sitemap registered by earlier versions
+                    for legacy in [
+                        "\nfrom django.contrib.sitemaps.views import sitemap\nfrom .sitemaps import StaticViewSitemap",
+                        "sitemaps = {\n    'static': StaticViewSitemap,\n}\n\n",
+                        "\n    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),",
+                    ]:
+                        urls_content = urls_content.replace(legacy, '')
+                    urls_content = re.sub(
+                        r"^from django\.urls import .*$",
+                        lambda m: m.group(0) + "\n"
+                        "from django.contrib.sitemaps import views as sitemap_views\n"
+                        "from django.views.decorators.cache import cache_page\n"
+                        "from .sitemaps import SITEMAPS",
+                        urls_content, count=1, flags=re.M
+                    )
+                    urls_content = urls_content.replace(
+                        "urlpatterns = [",
+                        "urlpatterns = [\n"
+                        f"    path('sitemap.xml', cache_page({SITEMAP_CACHE_SECONDS})(sitemap_views.index), {{'sitemaps': SITEMAPS}}, name='sitemap-index'),\n"
+                        f"    path('sitemap-<section>.xml', cache_page({SITEMAP_CACHE_SECONDS})(sitemap_views.sitemap), {{'sitemaps': SITEMAPS}}, name='django.contrib.sitemaps.views.sitemap'),",
+                        1
+                    )
                     with open(urls_path, 'w') as f:
                         f.write(urls_content)
-                    print("  - Registered sitemap.xml in urls.py")
+                    print("  - Registered sitemap.xml (index) and sitemap-<section>.xml in urls.py")
 
         if modified_settings:
             with open(settings_path, 'w') as f:
@@ -909,29 +2126,29 @@ def configure_deployment():
 
     # 4. Run collectstatic
     print("\n" + "="*40)
-    run_collectstatic = input("Do you want to run 'python manage.py collectstatic' now? (yes/no) [no]: ").strip().lower()
+    run_collectstatic = ask('deploy.collectstatic', "Do you want to run 'python manage.py collectstatic' now? (yes/no) [no]: ").strip().lower()
     if run_collectstatic in ['yes', 'y']:
         try:
              print("Running collectstatic...")
-             subprocess.check_call([sys.executable, 'manage.py', 'collectstatic', '--noinput'])
+             run_subprocess([sys.executable, 'manage.py', 'collectstatic', '--noinput'])
              print("✔ collectstatic completed.")
         except subprocess.CalledProcessError:
              print("✘ collectstatic failed. Please run it manually.")
 
     # 4.5 Run migrate
     print("\n" + "="*40)
-    run_migrate = input("Do you want to run 'python manage.py migrate' now? (yes/no) [no]: ").strip().lower()
+    run_migrate = ask('deploy.migrate', "Do you want to run 'python manage.py migrate' now? (yes/no) [no]: ").strip().lower()
     if run_migrate in ['yes', 'y']:
         try:
              print("Running migrate...")
-             subprocess.check_call([sys.executable, 'manage.py', 'migrate'])
+             run_subprocess([sys.executable, 'manage.py', 'migrate'])
              print("✔ migrate completed.")
 
              # 4.6 Update Site Domain
              print("\n" + "="*40)
              print(f"Updating Django Site domain to '{domain}'...")
              update_site_cmd = f"from django.contrib.sites.models import Site; Site.objects.update_or_create(id=1, defaults={{'domain': '{domain}', 'name': '{project_name}'}})"
-             subprocess.check_call([sys.executable, 'manage.py', 'shell', '-c', update_site_cmd])
+             run_subprocess([sys.executable, 'manage.py', 'shell', '-c', update_site_cmd])
              print(f"✔ Site domain updated to {domain}")
 
         except subprocess.CalledProcessError:
@@ -939,19 +2156,15 @@ def configure_deployment():
     
     # 5. Generate requirements.txt
     print("\n" + "="*40)
-    gen_reqs = input("Do you want to generate/update 'requirements.txt'? (yes/no) [yes]: ").strip().lower()
+    gen_reqs = ask('deploy.requirements', "Do you want to generate/update 'requirements.txt'? (yes/no) [yes]: ").strip().lower()
     if gen_reqs in ['', 'yes', 'y']:
-        try:
-            print("Generating requirements.txt...")
-            with open('requirements.txt', 'w') as f:
-                subprocess.check_call([sys.executable, '-m', 'pip', 'freeze'], stdout=f)
-            print("✔ requirements.txt generated.")
-        except subprocess.CalledProcessError:
-             print("✘ Failed to generate requirements.txt.")
+        imported_only = ask('deploy.requirements_imported_only', "Only include packages imported by the project (and their dependencies)? (yes/no) [no]: ").strip().lower()
+        with_hashes = ask('deploy.requirements_hashes', "Pin sha256 hashes for 'pip install --require-hashes'? (yes/no) [no]: ").strip().lower()
+        generate_requirements(imported_only=imported_only in ['yes', 'y'], with_hashes=with_hashes in ['yes', 'y'])
 
     # 6. Generate Tutorial
     print("\n" + "="*40)
-    gen_tutorial = input("Do you want to generate 'TUTORIAL_DEPLOY.md'? (yes/no) [yes]: ").strip().lower()
+    gen_tutorial = ask('deploy.tutorial', "Do you want to generate 'TUTORIAL_DEPLOY.md'? (yes/no) [yes]: ").strip().lower()
     if gen_tutorial in ['', 'yes', 'y']:
         tutorial_content = textwrap.dedent(f"""
         # Tutorial: Deploying Django with django-cli.py
@@ -985,14 +2198,15 @@ def configure_deployment():
 
         ## Step 3: Verified Files
         The tool will automatically:
-        1.  **Generate/Update `.htaccess`** with provided paths.
+        1.  **Generate/Update `.htaccess`** with provided paths (and, optionally, caching/compression rules for static and media files).
         2.  **Check `wsgi.py`**.
         3.  **Configure `settings.py`**:
             -   Add domain to `ALLOWED_HOSTS`.
             -   Set `DEBUG = False`.
             -   Set `STATIC_ROOT`.
             -   (Optional) Configure Whitenoise.
-            -   (Optional) Configure Sitemap.
+            -   (Optional) Enable persistent database connections (`CONN_MAX_AGE`, pooling).
+            -   (Optional) Configure Sitemap: a sitemap index with one cached, paginated section per `make:crud` model.
         4.  **Generate `requirements.txt`**.
         
         ## Step 4: Final Steps
@@ -1008,17 +2222,323 @@ def configure_deployment():
 
 
 
-def generate_requirements():
-    print("\nGenerating requirements.txt...")
+REQUIREMENTS_EXCLUDE = {'pip', 'setuptools', 'wheel', 'distribute'}  # same set pip freeze leaves out
+REQUIREMENTS_SKIP_DIRS = {'.git', '__pycache__', 'node_modules', 'static', 'staticfiles', 'media', 'uploads', 'venv', '.venv', 'env'}
+# Database drivers are loaded from settings.DATABASES['ENGINE'], never imported by the project itself
+DB_DRIVER_MODULES = {
+    'postgresql': ['psycopg', 'psycopg2', 'psycopg_pool'],
+    'mysql': ['MySQLdb', 'pymysql'],
+    'oracle': ['oracledb', 'cx_Oracle'],
+}
+# Same for hashers and cache backends named by dotted path, keyed by class name so subclasses
+# such as <project>.hashers.CalibratedArgon2PasswordHasher match too
+PASSWORD_HASHER_MODULES = {
+    'Argon2PasswordHasher': ['argon2'],
+    'BCryptSHA256PasswordHasher': ['bcrypt'],
+    'BCryptPasswordHasher': ['bcrypt'],
+}
+CACHE_BACKEND_MODULES = {
+    'RedisCache': ['redis'],
+    'PyMemcacheCache': ['pymemcache'],
+    'PyLibMCCache': ['pylibmc'],
+}
+# Built-in engines store through CACHES or the database; these third-party ones need a client library
+SESSION_ENGINE_MODULES = {
+    'redis_sessions.session': ['redis'],
+}
+
+def dotted_path_modules(value):
+    """Modules Django imports on the project's behalf for a hasher, cache backend or session engine path."""
+    modules = set(SESSION_ENGINE_MODULES.get(value, []))
+    class_name = value.rsplit('.', 1)[-1]
+    for suffix, drivers in list(PASSWORD_HASHER_MODULES.items()) + list(CACHE_BACKEND_MODULES.items()):
+        if class_name.endswith(suffix):
+            modules.update(drivers)
+    return modules
+
+def canonical_dist_name(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def scan_project_imports(root='.'):
+    """Top-level module names imported by the project's own modules, plus dotted paths named in settings strings."""
+    modules = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in REQUIREMENTS_SKIP_DIRS
+                       and not os.path.exists(os.path.join(dirpath, d, 'pyvenv.cfg'))]
+        for filename in filenames:
+            if not filename.endswith('.py') or filename == os.path.basename(__file__):
+                continue
+            try:
+                with open(os.path.join(dirpath, filename), 'r', encoding='utf-8') as f:
+                    tree = ast.parse(f.read())
+            except (SyntaxError, UnicodeDecodeError):
+                continue
+            is_settings = filename.startswith('settings')
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    modules.update(alias.name.split('.')[0] for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                    modules.add(node.module.split('.')[0])
+                    # e.g. hashers.py subclassing Argon2PasswordHasher
+                    for alias in node.names:
+                        modules.update(dotted_path_modules(alias.name))
+                elif is_settings and isinstance(node, ast.Constant) and isinstance(node.value, str):
+                    # INSTALLED_APPS, MIDDLEWARE, CACHES['BACKEND'], ...
+                    if re.fullmatch(r"[A-Za-z_]\w*(\.\w+)*", node.value):
+                        modules.add(node.value.split('.')[0])
+                        modules.update(dotted_path_modules(node.value))
+                    for engine, drivers in DB_DRIVER_MODULES.items():
+                        if node.value == f'django.db.backends.{engine}':
+                            modules.update(drivers)
+    return modules
+
+try:
+    from packaging.requirements import Requirement
+except ImportError:
+    Requirement = None  # markers other than 'extra' are then not evaluated
+
+def resolve_imported_distributions(modules, installed):
+    """Map imported modules to distributions, then follow their install requirements."""
+    module_map = importlib.metadata.packages_distributions()
+    pending = [canonical_dist_name(dist) for module in modules for dist in module_map.get(module, [])]
+    selected = set()
+    while pending:
+        key = pending.pop()
+        if key in selected or key not in installed:
+            continue
+        selected.add(key)
+        for requirement in installed[key].requires or []:
+            if Requirement is not None:
+                parsed = Requirement(requirement)
+                if parsed.marker is None or parsed.marker.evaluate({'extra': ''}):
+                    pending.append(canonical_dist_name(parsed.name))
+                continue
+            if re.search(r"\bextra\s*==", requirement):
+                continue
+            match = re.match(r"[A-Za-z0-9][A-Za-z0-9._-]*", requirement)
+            if match:
+                pending.append(canonical_dist_name(match.group(0)))
+    return selected
+
+def distribution_hashes(dist):
+    """sha256 digests for a distribution: the archive it was installed from, else every file PyPI has for the release."""
+    direct_url = dist.read_text('direct_url.json')
+    if direct_url:
+        archive = json.loads(direct_url).get('archive_info', {})
+        hashes = archive.get('hashes') or {}
+        if 'sha256' in hashes:
+            return [hashes['sha256']]
+        if archive.get('hash', '').startswith('sha256='):
+            return [archive['hash'].split('=', 1)[1]]
+        return []
+    url = f"https://pypi.org/pypi/{dist.metadata['Name']}/{dist.version}/json"
     try:
-        with open('requirements.txt', 'w') as f:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'freeze'], stdout=f)
-        print("✔ requirements.txt generated/updated successfully.")
-    except subprocess.CalledProcessError:
-        print("✘ Failed to generate requirements.txt.")
+        with urllib.request.urlopen(url, timeout=10) as response:
+            release = json.load(response)
+    except (OSError, ValueError):
+        return []
+    return sorted({file['digests']['sha256'] for file in release.get('urls', []) if 'sha256' in file.get('digests', {})})
+
+def format_requirement(dist):
+    name = dist.metadata['Name']
+    direct_url = dist.read_text('direct_url.json')
+    if direct_url:
+        info = json.loads(direct_url)
+        if info.get('dir_info', {}).get('editable'):
+            return f"-e {info['url']}"
+        if 'vcs_info' in info:
+            vcs = info['vcs_info']
+            return f"{name} @ {vcs['vcs']}+{info['url']}@{vcs['commit_id']}"
+        if 'archive_info' in info or 'dir_info' in info:
+            return f"{name} @ {info['url']}"
+    return f"{name}=={dist.version}"
+
+@traced
+def generate_requirements(output='requirements.txt', imported_only=False, with_hashes=False):
+    print(f"\nGenerating {output}...")
+    installed = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name and canonical_dist_name(name) not in REQUIREMENTS_EXCLUDE:
+            installed.setdefault(canonical_dist_name(name), dist)
+
+    selected = set(installed)
+    if imported_only:
+        selected = resolve_imported_distributions(scan_project_imports(), installed)
+        print(f"  - {len(selected)} of {len(installed)} installed distributions are imported by the project (including dependencies).")
+
+    lines = []
+    missing_hashes = []
+    for key in sorted(selected):
+        dist = installed[key]
+        line = format_requirement(dist)
+        if with_hashes and not line.startswith('-e '):
+            hashes = distribution_hashes(dist)
+            if hashes:
+                line += "".join(f" \\\n    --hash=sha256:{digest}" for digest in hashes)
+            else:
+                missing_hashes.append(dist.metadata['Name'])
+        lines.append(line)
+
+    with open(output, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"✔ {output} generated/updated successfully ({len(lines)} packages).")
+    if missing_hashes:
+        print(f"✘ No sha256 found for: {', '.join(missing_hashes)}. 'pip install --require-hashes' will refuse this file until they are added.")
     print("\n")
 
-def generate_command(app_name, command_name):
+BATCH_COMMAND_TEMPLATE = '''
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Max, Min
+
+
+def _init_worker(settings_module):
+    # Spawned processes start from a fresh interpreter: configure Django once per worker
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def process_chunk(start, end):
+    """Handle the __MODEL__ rows with start <= pk < end in one transaction; return the row count."""
+    from __APP__.models import __MODEL__
+
+    close_old_connections()
+    with transaction.atomic():
+        objs = list(__MODEL__.objects.filter(pk__gte=start, pk__lt=end).order_by('pk'))
+        for obj in objs:
+            # Backfill logic here, e.g. obj.slug = slugify(obj.name)
+            pass
+        # __MODEL__.objects.bulk_update(objs, ['slug'])
+    return len(objs)
+
+
+class Command(BaseCommand):
+    help = 'Process __MODEL__ rows in primary-key chunks, resumable from a checkpoint file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Primary-key range handled per transaction')
+        parser.add_argument('--workers', type=int, default=1, help='Worker processes (1 = run in this process)')
+        parser.add_argument('--checkpoint', default='.__COMMAND__.checkpoint', help='File holding the resume position')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and start from the first row')
+
+    def handle(self, *args, **options):
+        from __APP__.models import __MODEL__
+
+        if __MODEL__._meta.pk.get_internal_type() not in ('AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField', 'BigIntegerField'):
+            raise CommandError('__MODEL__ needs an integer primary key to be split into ranges.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1.')
+        chunk_size = options['chunk_size']
+        self.verbosity = options['verbosity']
+        self.checkpoint = options['checkpoint']
+
+        bounds = __MODEL__.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write('Nothing to process.')
+            return
+        start = bounds['first']
+        if options['restart'] and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+        watermark = self.read_checkpoint()
+        if watermark is not None:
+            start = max(start, watermark)
+            self.stdout.write(f'Resuming from pk {start} ({self.checkpoint}).')
+        ranges = [(lo, min(lo + chunk_size, bounds['last'] + 1)) for lo in range(start, bounds['last'] + 1, chunk_size)]
+        if not ranges:
+            self.stdout.write('Checkpoint is past the last row; use --restart to run again.')
+            return
+
+        workers = options['workers']
+        if workers > 1 and connection.vendor == 'sqlite':
+            self.stderr.write('SQLite allows a single writer at a time: running with --workers 1.')
+            workers = 1
+
+        self.rows = 0
+        self.started = self.last_report = time.perf_counter()
+        if workers > 1:
+            self.run_parallel(ranges, workers)
+        else:
+            for lo, hi in ranges:
+                self.chunk_done(process_chunk(lo, hi), hi)
+
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {self.rows} rows in {len(ranges)} chunks, {elapsed:.1f}s ({self.rows / max(elapsed, 1e-9):.0f} rows/s).'
+        ))
+
+    def run_parallel(self, ranges, workers):
+        # Results arrive out of order: only the contiguous prefix of finished ranges is checkpointed
+        finished = set()
+        next_watermark = 0
+        pending = {}
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(os.environ['DJANGO_SETTINGS_MODULE'],),
+        ) as pool:
+            try:
+                for lo, hi in ranges:
+                    pending[pool.submit(process_chunk, lo, hi)] = (lo, hi)
+                    if len(pending) < workers * 2:
+                        continue
+                    # Keep a bounded number of ranges in flight
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    next_watermark = self.collect(done, pending, finished, ranges, next_watermark)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    next_watermark = self.collect(done, pending, finished, ranges, next_watermark)
+            except BaseException:
+                # Drop queued ranges; the checkpoint stays at the last contiguous finished range
+                pool.shutdown(cancel_futures=True)
+                raise
+
+    def collect(self, done, pending, finished, ranges, next_watermark):
+        for future in done:
+            lo, hi = pending.pop(future)
+            self.rows += future.result()
+            finished.add(lo)
+        while next_watermark < len(ranges) and ranges[next_watermark][0] in finished:
+            next_watermark += 1
+        if next_watermark:
+            self.chunk_done(0, ranges[next_watermark - 1][1])
+        return next_watermark
+
+    def chunk_done(self, rows, next_pk):
+        self.rows += rows
+        self.write_checkpoint(next_pk)
+        now = time.perf_counter()
+        if self.verbosity >= 2 or now - self.last_report >= 1:
+            self.last_report = now
+            self.stdout.write(f'  pk < {next_pk}: {self.rows} rows, {self.rows / (now - self.started):.0f} rows/s')
+
+    def read_checkpoint(self):
+        try:
+            with open(self.checkpoint) as f:
+                return json.load(f)['next_pk']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def write_checkpoint(self, next_pk):
+        # Write then rename so an interrupted run never leaves a truncated checkpoint
+        tmp_path = self.checkpoint + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'next_pk': next_pk}, f)
+        os.replace(tmp_path, self.checkpoint)
+'''
+
+@traced
+def generate_command(app_name, command_name, batch_model=None):
     print(f"\nGenerating management command '{command_name}' for {app_name}...")
     management_dir = os.path.join(app_name, 'management')
     commands_dir = os.path.join(management_dir, 'commands')
@@ -1037,26 +2557,147 @@ def generate_command(app_name, command_name):
         print(f"Command '{command_name}' already exists in '{app_name}'. Skipping.")
         return
 
-    content = textwrap.dedent(f"""
-    from django.core.management.base import BaseCommand
+    if batch_model:
+        content = BATCH_COMMAND_TEMPLATE.replace('__APP__', app_name).replace('__MODEL__', batch_model).replace('__COMMAND__', command_name)
+    else:
+        content = textwrap.dedent(f"""
+        from django.core.management.base import BaseCommand
 
-    class Command(BaseCommand):
-        help = 'Description of {command_name} command'
+        class Command(BaseCommand):
+            help = 'Description of {command_name} command'
 
-        def add_arguments(self, parser):
-            # Optional: add arguments here
-            # parser.add_argument('my_arg', type=str)
-            pass
+            def add_arguments(self, parser):
+                # Optional: add arguments here
+                # parser.add_argument('my_arg', type=str)
+                pass
 
-        def handle(self, *args, **options):
-            self.stdout.write(self.style.SUCCESS('Successfully ran {command_name}'))
-    """)
+            def handle(self, *args, **options):
+                self.stdout.write(self.style.SUCCESS('Successfully ran {command_name}'))
+        """)
     
     with open(command_path, 'w') as f:
         f.write(content.strip() + "\n")
     print(f"✔ Command created: {command_path}")
 
-def generate_service(app_name, service_name):
+def pooled_service_code(class_name, service_name, pool, workers):
+    # Multi-line parts are substituted after dedent so their indentation survives
+    if pool == 'process':
+        parts = {
+            '__IMPORTS__': "import atexit\nimport multiprocessing\nimport os\nimport threading\nfrom concurrent.futures import ProcessPoolExecutor\n\nfrom django.db import close_old_connections",
+            '__EXECUTOR__': (
+                "ProcessPoolExecutor(\n"
+                "                    max_workers=MAX_WORKERS,\n"
+                "                    mp_context=multiprocessing.get_context('spawn'),\n"
+                "                    initializer=_init_worker,\n"
+                "                    initargs=(os.environ['DJANGO_SETTINGS_MODULE'],),\n"
+                "                )"
+            ),
+            '    __BEFORE_TASK__\n': "    close_old_connections()\n",
+            '__AFTER_TASK__': "# Keep the process's connection for the next task, but honour CONN_MAX_AGE\n        close_old_connections()",
+            '__EXECUTE_NOTE__': " Import models inside this method: workers load this module\n        # before django.setup() has run. Arguments and results must be picklable.",
+            '__INIT_WORKER__\n': (
+                "def _init_worker(settings_module):\n"
+                "    # Spawned processes start from a fresh interpreter: configure Django once per worker\n"
+                "    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)\n"
+                "    import django\n"
+                "    django.setup()\n\n\n"
+            ),
+        }
+    else:
+        parts = {
+            '__IMPORTS__': "import atexit\nimport threading\nfrom concurrent.futures import ThreadPoolExecutor\n\nfrom django.db import connections",
+            '__EXECUTOR__': f"ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='{class_name}')",
+            '    __BEFORE_TASK__\n': "",
+            '__AFTER_TASK__': "# Pool threads outlive requests: close the connection this thread opened\n        connections.close_all()",
+            '__EXECUTE_NOTE__': "",
+            '__INIT_WORKER__\n': "",
+        }
+
+    content = textwrap.dedent(f"""
+    __IMPORTS__
+
+    # Worker pool settings (make:service --pool {pool} --workers N); None lets the executor choose
+    MAX_WORKERS = {workers}
+
+
+    __INIT_WORKER__
+    def _run_task(args, kwargs):
+        __BEFORE_TASK__
+        try:
+            return {class_name}.execute(*args, **kwargs)
+        finally:
+            __AFTER_TASK__
+
+
+    class {class_name}:
+        \"\"\"
+        Service class to handle business logic for {service_name}, run in a shared {pool} pool.
+
+        {class_name}.submit(...) returns a Future; {class_name}.map(...) yields results in order.
+        \"\"\"
+
+        _executor = None
+        _lock = threading.Lock()
+        _pending = 0
+
+        @staticmethod
+        def execute(*args, **kwargs):
+            # Add business logic here.__EXECUTE_NOTE__
+            pass
+
+        @classmethod
+        def executor(cls):
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = __EXECUTOR__
+                return cls._executor
+
+        @classmethod
+        def submit(cls, *args, **kwargs):
+            executor = cls.executor()
+            with cls._lock:
+                cls._pending += 1
+            try:
+                future = executor.submit(_run_task, args, kwargs)
+            except BaseException:
+                cls._task_done(None)
+                raise
+            future.add_done_callback(cls._task_done)
+            return future
+
+        @classmethod
+        def map(cls, *iterables, timeout=None):
+            # Everything is queued up front, like Executor.map
+            futures = [cls.submit(*args) for args in zip(*iterables)]
+            return (future.result(timeout=timeout) for future in futures)
+
+        @classmethod
+        def queue_depth(cls):
+            \"\"\"Tasks submitted and not finished yet (queued or running).\"\"\"
+            return cls._pending
+
+        @classmethod
+        def _task_done(cls, future):
+            with cls._lock:
+                cls._pending -= 1
+
+        @classmethod
+        def shutdown(cls, wait=True, cancel_futures=False):
+            \"\"\"Stop accepting work; wait for running tasks, optionally dropping queued ones.\"\"\"
+            with cls._lock:
+                executor, cls._executor = cls._executor, None
+            if executor is not None:
+                executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+    atexit.register({class_name}.shutdown)
+    """)
+    for marker, code in parts.items():
+        content = content.replace(marker, code)
+    return content
+
+@traced
+def generate_service(app_name, service_name, pool=None, workers=None):
     print(f"\nGenerating service '{service_name}' for {app_name}...")
     services_dir = os.path.join(app_name, 'services')
     os.makedirs(services_dir, exist_ok=True)
@@ -1085,24 +2726,59 @@ def generate_service(app_name, service_name):
         print(f"Service '{file_name}' already exists in '{app_name}'. Skipping.")
         return
 
-    content = textwrap.dedent(f"""
-    class {class_name}:
-        \"\"\"
-        Service class to handle business logic for {service_name}.
-        \"\"\"
-
-        def __init__(self):
-            pass
-
-        def execute(self, *args, **kwargs):
-            # Add business logic here
-            pass
-    """)
+    if pool:
+        content = pooled_service_code(class_name, service_name, pool, workers)
+    else:
+        content = textwrap.dedent(f"""
+        class {class_name}:
+            \"\"\"
+            Service class to handle business logic for {service_name}.
+            \"\"\"
+
+            def __init__(self):
+                pass
+
+            def execute(self, *args, **kwargs):
+                # Add business logic here
+                pass
+        """)
     
     with open(service_path, 'w') as f:
         f.write(content.strip() + "\n")
     print(f"✔ Service created: {service_path}")
 
+def pop_option(args, name, default=None):
+    # Remove "name value" (or "name=value") from args and return the value
+    for i, arg in enumerate(args):
+        if arg == name:
+            if i + 1 >= len(args) or args[i + 1].startswith('--'):
+                print(f"Error: {name} expects a value.")
+                sys.exit(1)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        if arg.startswith(name + '='):
+            del args[i]
+            return arg.split('=', 1)[1]
+    return default
+
+def pop_int_option(args, name):
+    # pop_option for a count such as -j N: exit with an error unless it is a positive integer
+    value = pop_option(args, name)
+    if value is None:
+        return None
+    if not value.isdigit() or int(value) < 1:
+        print(f"Error: {name} expects a positive integer, got '{value}'.")
+        sys.exit(1)
+    return int(value)
+
+def pop_flag(args, name):
+    if name in args:
+        args.remove(name)
+        return True
+    return False
+
+@traced
 def process_command(command, args):
     if command == 'make:app':
         if len(args) < 1:
@@ -1119,28 +2795,28 @@ def process_command(command, args):
          ensure_model_exists(app_name, model_name)
     
     elif command in ['make:crud', 'make:view', 'make:form']:
+         jobs = pop_int_option(args, '-j')
          if len(args) < 2:
-            print(f"Usage: python django-cli.py {command} <app_name> <model_name>")
+            print(f"Usage: python django-cli.py {command} <app_name> <model_name> [<model_name> ...] [-j N]")
             return
-         app_name, model_name = args[0], args[1]
-         
-         ensure_app_exists(app_name)
-         ensure_model_exists(app_name, model_name)
-         
-         model_class = get_model_class(app_name, model_name)
-
-         if command == 'make:view' or command == 'make:crud':
-             generate_views(app_name, model_name)
-             generate_urls(app_name, model_name)
-             generate_templates(app_name, model_name, model_class)
+         generate_crud(args[0], args[1:], command, jobs)
 
     elif command == 'make:command':
+        if pop_flag(args, '--batch'):
+            if len(args) < 2:
+                print("Usage: python django-cli.py make:command --batch <app_name> <model_name> [command_name]")
+                return
+            app_name, model_name = args[0], args[1]
+            command_name = args[2] if len(args) > 2 else f"backfill_{model_name.lower()}"
+            ensure_app_exists(app_name)
+            generate_command(app_name, command_name, batch_model=model_name)
+            return
         if len(args) < 1:
-            app_name = input("App name: ").strip()
-            command_name = input("Command name: ").strip()
+            app_name = ask('make.app_name', "App name: ").strip()
+            command_name = ask('make.command_name', "Command name: ").strip()
         elif len(args) == 1:
             app_name = args[0]
-            command_name = input("Command name: ").strip()
+            command_name = ask('make.command_name', "Command name: ").strip()
         else:
             app_name, command_name = args[0], args[1]
         
@@ -1152,12 +2828,17 @@ def process_command(command, args):
         generate_command(app_name, command_name)
 
     elif command == 'make:service':
+        pool = pop_option(args, '--pool')
+        workers = pop_int_option(args, '--workers')
+        if pool not in [None, 'thread', 'process']:
+            print("Error: --pool must be 'thread' or 'process'.")
+            return
         if len(args) < 1:
-            app_name = input("App name: ").strip()
-            service_name = input("Service name: ").strip()
+            app_name = ask('make.app_name', "App name: ").strip()
+            service_name = ask('make.service_name', "Service name: ").strip()
         elif len(args) == 1:
             app_name = args[0]
-            service_name = input("Service name: ").strip()
+            service_name = ask('make.service_name', "Service name: ").strip()
         else:
             app_name, service_name = args[0], args[1]
         
@@ -1166,20 +2847,20 @@ def process_command(command, args):
             return
 
         ensure_app_exists(app_name)
-        generate_service(app_name, service_name)
+        generate_service(app_name, service_name, pool, workers)
              
     elif command == 'route:list':
         list_routes()
     
     if command in ['make:model', 'make:crud']:
          print("\n" + "="*40)
-         do_migrate = input("Do you want to apply database migrations now? (yes/no) [yes]: ").strip().lower()
+         do_migrate = ask('make.migrate', "Do you want to apply database migrations now? (yes/no) [yes]: ").strip().lower()
          if do_migrate in ['', 'yes', 'y']:
              try:
                  print("Running makemigrations...")
-                 subprocess.check_call([sys.executable, 'manage.py', 'makemigrations'])
+                 run_subprocess([sys.executable, 'manage.py', 'makemigrations'])
                  print("Running migrate...")
-                 subprocess.check_call([sys.executable, 'manage.py', 'migrate'])
+                 run_subprocess([sys.executable, 'manage.py', 'migrate'])
                  print("Migrations applied successfully.")
              except subprocess.CalledProcessError:
                  print("Error applying migrations.")
@@ -1197,7 +2878,7 @@ def process_command(command, args):
                 print("Error: manage.py found. A project likely already exists here.")
                 return
 
-            subprocess.check_call([sys.executable, '-m', 'django', 'startproject', project_name, '.'])
+            run_subprocess([sys.executable, '-m', 'django', 'startproject', project_name, '.'])
             print(f"Project '{project_name}' initialized successfully.")
             
             # Post-init setup
@@ -1213,10 +2894,40 @@ def process_command(command, args):
         configure_deployment()
     
     elif command == 'generate:requirements':
-        generate_requirements()
+        output = pop_option(args, '-o', 'requirements.txt')
+        generate_requirements(output, imported_only=pop_flag(args, '--imported-only'), with_hashes=pop_flag(args, '--hashes'))
+
+    elif command == 'cache:config':
+        configure_cache(args[0] if args else None)
+
+    elif command == 'static:build':
+        jobs = pop_int_option(args, '-j')
+        force = pop_flag(args, '--force')
+        collect = not pop_flag(args, '--no-collect')
+        build_static(jobs, collect, force)
+
+    elif command == 'htaccess:validate':
+        validate_htaccess(args[0] if args else '.htaccess')
+
+    elif command == 'media:sendfile':
+        configure_sendfile(args[0] if args else None)
+
+    elif command == 'make:thumbnails':
+        if len(args) < 1:
+            print("Usage: python django-cli.py make:thumbnails <app_name>")
+            return
+        ensure_app_exists(args[0])
+        generate_thumbnails(args[0])
+
+    elif command == 'db:tune':
+        if len(args) < 1 or args[0] != 'sqlite':
+            print("Usage: python django-cli.py db:tune sqlite")
+            return
+        tune_sqlite()
 
 
 if __name__ == "__main__":
+    sys.argv[1:] = start_tracing(load_answers(sys.argv[1:]))
     setup_django()
     
     if len(sys.argv) > 1:
@@ -1230,11 +2941,20 @@ if __name__ == "__main__":
         print("  python django-cli.py make:model <app_name> <model_name>")
         print("  python django-cli.py make:form <app_name> <model_name>")
         print("  python django-cli.py make:view <app_name> <model_name>")
-        print("  python django-cli.py make:crud <app_name> <model_name>")
+        print("  python django-cli.py make:crud <app_name> <model_name> [<model_name> ...] [-j N]")
         print("  python django-cli.py make:command <app_name> <command_name>")
-        print("  python django-cli.py make:service <app_name> <service_name>")
+        print("  python django-cli.py make:command --batch <app_name> <model_name> [command_name] (Chunked, resumable backfill)")
+        print("  python django-cli.py make:service <app_name> <service_name> [--pool thread|process] [--workers N]")
+        print("  python django-cli.py make:thumbnails <app_name> (Resized WebP/JPEG derivatives + {% load thumbnails %})")
         print("  python django-cli.py route:list")
         print("  python django-cli.py init:project  (Initialize new project in current dir)")
         print("  python django-cli.py deploy:config (Generate .htaccess and check wsgi.py for deployment)")
-        print("  python django-cli.py generate:requirements (Generate requirements.txt)")
+        print("  python django-cli.py generate:requirements [--imported-only] [--hashes] [-o file] (Generate requirements.txt)")
+        print("  python django-cli.py db:tune sqlite (WAL, synchronous, mmap and busy_timeout for SQLite)")
+        print("  python django-cli.py cache:config [file|db|locmem|memcached|redis] (Configure CACHES)")
+        print("  python django-cli.py static:build [-j N] [--force] [--no-collect] (Collect and hash static files, then precompress them in parallel)")
+        print("  python django-cli.py htaccess:validate [path] (Check .htaccess caching rules against STATIC_ROOT)")
+        print("  python django-cli.py media:sendfile [apache|nginx|django] (Serve uploads through X-Sendfile / X-Accel-Redirect)")
+        print("Global options: --answers file.json (pre-filled answers), --yes (accept every default),")
+        print("                --timings (phase timing summary), --trace file.json (Chrome trace events)")
 
@@ -0,0 +1,40 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('django')
+from django.contrib.auth import hashers as django_hashers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_cli():
+    spec = importlib.util.spec_from_file_location('django_auth_cli', os.path.join(ROOT, 'django-auth-cli.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize('algorithm', ['argon2', 'bcrypt'])
+@pytest.mark.parametrize('host_ms', [1, 10_000], ids=['fast-host', 'slow-host'])
+def test_generated_hashers_never_weaker_than_django_defaults(tmp_path, monkeypatch, algorithm, host_ms):
+    cli = load_cli()
+    class_name = cli.HASHER_PROFILES[algorithm][0]
+    base = getattr(django_hashers, class_name)
+    params = cli.calibrate_params(algorithm, base, target_ms=250, timer=lambda hasher: host_ms)
+
+    (tmp_path / 'proj').mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cli.write_hashers_module('proj', algorithm, params, 250)
+    sys.modules.pop('proj.hashers', None)
+    generated = getattr(importlib.import_module('proj.hashers'), f'Calibrated{class_name}')
+
+    assert issubclass(generated, base)
+    assert params
+    for name in params:
+        assert getattr(generated, name) >= getattr(base, name), name
+    if host_ms > 250:
+        assert params == {name: getattr(base, name) for name in params}
@@ -0,0 +1,36 @@
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip('django')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_cli():
+    spec = importlib.util.spec_from_file_location('django_cli', os.path.join(ROOT, 'django-cli.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def no_terminal(prompt=''):
+    raise EOFError(prompt)
+
+
+def test_yes_ends_field_entry_without_a_terminal(monkeypatch):
+    cli = load_cli()
+    monkeypatch.setattr('builtins.input', no_terminal)
+    cli.load_answers(['make:crud', 'shop', 'Produit', '--yes'])
+    assert cli.get_fields_interactive() == ""
+    assert cli.get_fields_interactive(existing_model=True) == ""
+
+
+def test_field_prompts_read_environment_answers(monkeypatch):
+    cli = load_cli()
+    monkeypatch.setattr('builtins.input', no_terminal)
+    monkeypatch.setenv('DJANGO_CLI_MODEL_FIELD_NAME', 'titre')
+    monkeypatch.setenv('DJANGO_CLI_MODEL_FIELD_MAX_LENGTH', '120')
+    cli.load_answers(['--yes'])
+    assert cli.get_fields_interactive() == "    titre = models.CharField(max_length=120)\n"